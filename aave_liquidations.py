@@ -36,27 +36,96 @@ Usage
 
 Requirements
 ------------
-    pip install requests
+    pip install urllib3
+    pip install orjson  # optional, faster JSON parsing
+    pip install brotli  # optional, enables brotli-compressed responses
+    pip install backports.zstd  # optional (Python < 3.14), enables zstd-compressed responses
+    pip install pyarrow # optional, enables Parquet output (--format parquet)
+    pip install numpy   # optional, enables column-array output (--format npz)
+    pip install zstandard  # optional, enables zstd-compressed JSON output (--compress)
 
 Author: Generated with Claude Code
 """
 
 import argparse
+import functools
+import hashlib
+import itertools
 import json
+import logging
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
-import requests
+import urllib3
+
+# orjson parses ~2-4x faster than the stdlib json module. It is optional;
+# fall back to stdlib json when it isn't installed.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize a request payload to compact JSON bytes."""
+        return orjson.dumps(obj)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize a request payload to compact JSON bytes."""
+        return _stdlib_dumps(obj, indent=False)
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    """
+    Serialize to JSON bytes with the stdlib json module, indented or compact.
+
+    Output records always go through here rather than orjson: orjson rejects
+    integers outside the 64-bit range, which wei-denominated amounts and the
+    max-uint256 health factor routinely exceed.
+    """
+    if indent:
+        return json.dumps(obj, indent=2, default=str).encode()
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+# numpy enables the struct-of-arrays output (--format npz). Optional.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# zstandard enables compressed JSON/JSONL output (--compress). Optional.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# pyarrow enables the columnar bulk formatter and Parquet output. Optional.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Progress goes through logging; per-page messages are DEBUG, so they cost
+# nothing unless --verbose is set
+logger = logging.getLogger("aave")
 
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AaveSubgraphConfig:
     """
     Configuration for an AAVE subgraph endpoint.
@@ -78,6 +147,9 @@ class AaveSubgraphConfig:
 # Base URL for The Graph decentralized network
 GRAPH_BASE_URL = "https://gateway.thegraph.com/api/{api_key}/subgraphs/id/"
 
+# Connect/read timeouts in seconds for subgraph requests
+REQUEST_TIMEOUT = urllib3.Timeout(connect=5, read=30)
+
 # AAVE Subgraph configurations
 AAVE_SUBGRAPHS = {
     "aave_v3_ethereum": AaveSubgraphConfig(
@@ -102,15 +174,17 @@ QUERIES = {
     #         liquidatedCollateralAmount, profit, timestamp
     # Note: Reserve only has id and underlyingAsset fields
     # Note: profit field exists in schema but is always 0 (not populated by handler)
+    # Pagination: keyset on timestamp (see TIMESTAMP_CURSOR_QUERIES) - $cursor is
+    # the oldest timestamp seen so far and $seenIds the ids already returned at it
     "liquidations": """
-    query GetLiquidations($first: Int!, $skip: Int!, $user: String, $startTime: BigInt, $endTime: BigInt) {
+    query GetLiquidations($first: Int!, $user: String, $startTime: BigInt, $cursor: BigInt, $seenIds: [String!]) {
         liquidations(
             first: $first
-            skip: $skip
             where: {
                 user_: { id: $user }
                 timestamp_gte: $startTime
-                timestamp_lte: $endTime
+                timestamp_lte: $cursor
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
@@ -136,13 +210,13 @@ QUERIES = {
 
     # Query liquidations without user filter
     "liquidations_all": """
-    query GetLiquidationsAll($first: Int!, $skip: Int!, $startTime: BigInt, $endTime: BigInt) {
+    query GetLiquidationsAll($first: Int!, $startTime: BigInt, $cursor: BigInt, $seenIds: [String!]) {
         liquidations(
             first: $first
-            skip: $skip
             where: {
                 timestamp_gte: $startTime
-                timestamp_lte: $endTime
+                timestamp_lte: $cursor
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
@@ -173,14 +247,91 @@ QUERIES = {
             first: $first
             skip: $skip
         ) {
-            id
-            underlyingAsset
+            ...ReserveFields
         }
     }
     """,
 
 }
 
+# Field selections shared by single-page and batched (aliased) queries.
+# Maps query name -> (fragment name, fragment definition).
+QUERY_FRAGMENTS = {
+    "reserves": ("ReserveFields", """
+    fragment ReserveFields on Reserve {
+        id
+        underlyingAsset
+    }
+    """),
+}
+
+for _name, (_, _fragment) in QUERY_FRAGMENTS.items():
+    QUERIES[_name] += _fragment
+
+
+_QUERY_PUNCTUATION_RE = re.compile(r"\s*([{}():,!\[\]=])\s*")
+
+
+def minify_query(query: str) -> str:
+    """
+    Strip comments and insignificant whitespace from a GraphQL document.
+
+    The queries here contain no string literals, so every run of whitespace
+    is insignificant and can be collapsed (or dropped next to punctuation).
+    """
+    query = re.sub(r"#[^\n]*", "", query)
+    query = re.sub(r"\s+", " ", query).strip()
+    return _QUERY_PUNCTUATION_RE.sub(r"\1", query)
+
+
+# Queries are re-sent with every page; send them minified
+QUERIES = {name: minify_query(query) for name, query in QUERIES.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def query_hash(query: str) -> str:
+    """SHA-256 hex digest of a query, as used by Automatic Persisted Queries."""
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def build_batched_query(
+    query_name: str,
+    entity_name: str,
+    pages: list[dict[str, Any]],
+) -> tuple[str, dict[str, Any]]:
+    """
+    Build one GraphQL document that fetches several skip/first pages.
+
+    Each page becomes an aliased root field (p0, p1, ...) selecting the
+    query's shared fragment, so N pages cost a single HTTP round-trip.
+
+    Args:
+        query_name: Key in QUERY_FRAGMENTS
+        entity_name: Root field to query (e.g., "reserves")
+        pages: Page variables, each with "first" and "skip"
+
+    Returns:
+        Tuple of (query string, variables)
+    """
+    fragment_name, fragment = QUERY_FRAGMENTS[query_name]
+    params = ", ".join(f"$first{i}: Int!, $skip{i}: Int!" for i in range(len(pages)))
+    fields = "\n".join(
+        f"        p{i}: {entity_name}(first: $first{i}, skip: $skip{i}) {{ ...{fragment_name} }}"
+        for i in range(len(pages))
+    )
+    variables = {}
+    for i, page in enumerate(pages):
+        variables[f"first{i}"] = page["first"]
+        variables[f"skip{i}"] = page["skip"]
+
+    return minify_query(f"query Batched({params}) {{\n{fields}\n    }}\n{fragment}"), variables
+
+
+# Queries paginated with a timestamp cursor instead of skip. Each page costs
+# O(page_size) on the indexer regardless of depth, and there is no 5000-row
+# skip ceiling, so arbitrarily deep history can be scanned.
+TIMESTAMP_CURSOR_QUERIES = {"liquidations", "liquidations_all"}
+
 
 # =============================================================================
 # AAVE CLIENT
@@ -199,6 +350,9 @@ class AaveGraphClient:
         config: AaveSubgraphConfig,
         api_key: Optional[str] = None,
         rate_limit_delay: float = 0.5,
+        concurrency: int = 4,
+        batch_size: int = 5,
+        persisted_queries: bool = False,
     ):
         """
         Initialize the AAVE Graph client.
@@ -207,10 +361,23 @@ class AaveGraphClient:
             config: Subgraph configuration
             api_key: The Graph API key
             rate_limit_delay: Delay between paginated requests
+            concurrency: Maximum number of page requests in flight at once
+            batch_size: Pages aliased into a single request, for queries
+                that support it (see QUERY_FRAGMENTS)
+            persisted_queries: Use Automatic Persisted Queries: after a
+                query has been sent once, later requests carry only its
+                SHA-256 hash. Needs gateway support, so it is off by default.
         """
         self.config = config
         self.api_key = api_key or os.environ.get("GRAPH_API_KEY")
         self.rate_limit_delay = rate_limit_delay
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.persisted_queries = persisted_queries
+
+        # Hashes of queries the server has accepted in full, and so can be
+        # sent hash-only from then on
+        self._persisted_hashes: set[str] = set()
 
         if not self.api_key:
             raise ValueError(
@@ -220,16 +387,60 @@ class AaveGraphClient:
 
         self.url = GRAPH_BASE_URL.format(api_key=self.api_key) + config.subgraph_id
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        # One keep-alive pool shared by all paginated requests. Size it to the
+        # concurrency so parallel pages reuse TLS connections instead of
+        # opening (and discarding) extra ones. urllib3 is used directly rather
+        # than through requests to skip its per-call Session/adapter layers.
+        # make_headers advertises gzip/deflate, plus br when brotli is installed
+        # and zstd with backports.zstd (or on Python 3.14+).
+        headers = urllib3.make_headers(accept_encoding=True)
+        headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json",
         })
+        self.http = urllib3.PoolManager(
+            num_pools=1,
+            maxsize=self.concurrency,
+            headers=headers,
+            retries=urllib3.Retry(3, backoff_factor=0.3),
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    def _post(self, payload: dict[str, Any]) -> urllib3.HTTPResponse:
+        """POST a GraphQL payload, raising on HTTP error statuses."""
+        response = self.http.request(
+            "POST",
+            self.url,
+            body=_dumps(payload),
+        )
+        if response.status >= 400:
+            response.release_conn()
+            raise urllib3.exceptions.HTTPError(f"HTTP {response.status} from {self.config.name} subgraph")
+        return response
+
+    def _payload(self, query: str, variables: dict[str, Any], hash_only: bool = False) -> dict[str, Any]:
+        """Build a request payload, with a persisted-query hash if enabled."""
+        payload: dict[str, Any] = {"variables": variables}
+        if not hash_only:
+            payload["query"] = query
+        if self.persisted_queries:
+            payload["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+        return payload
+
+    def _persisted_payload(self, query: str, variables: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Return a hash-only payload if the server already knows this query."""
+        if self.persisted_queries and query_hash(query) in self._persisted_hashes:
+            return self._payload(query, variables, hash_only=True)
+        return None
 
     def query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
         """
         Execute a GraphQL query.
 
+        With persisted queries enabled, a query the server has already seen
+        is sent as its hash alone; if the server has evicted it (or rejects
+        the hash for any other reason) the full query is sent again.
+
         Args:
             query: GraphQL query string
             variables: Query variables
@@ -239,17 +450,26 @@ class AaveGraphClient:
 
         Raises:
             ValueError: If the response contains GraphQL errors
-            requests.RequestException: If the HTTP request fails
+            urllib3.exceptions.HTTPError: If the HTTP request fails
         """
-        payload = {
-            "query": query,
-            "variables": variables,
-        }
+        payload = self._persisted_payload(query, variables)
+        if payload is not None:
+            try:
+                return self._query_once(payload)
+            except ValueError:
+                self._persisted_hashes.discard(query_hash(query))
+
+        data = self._query_once(self._payload(query, variables))
+        if self.persisted_queries:
+            self._persisted_hashes.add(query_hash(query))
+        return data
 
-        response = self.session.post(self.url, json=payload)
-        response.raise_for_status()
+    def _query_once(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Send one payload and return its data, raising on GraphQL errors."""
+        response = self._post(payload)
 
-        result = response.json()
+        # Parse the raw bytes directly, avoiding a decode-to-str round-trip
+        result = _loads(response.data)
 
         if "errors" in result:
             error_messages = [e.get("message", str(e)) for e in result["errors"]]
@@ -263,11 +483,19 @@ class AaveGraphClient:
         variables: dict[str, Any],
         entity_name: str,
         max_items: Optional[int] = None,
-        page_size: int = 100,
+        page_size: int = 1000,
     ) -> list[dict[str, Any]]:
         """
         Execute a paginated query.
 
+        Queries in TIMESTAMP_CURSOR_QUERIES are paginated with a timestamp
+        cursor (see iter_with_cursor). For the rest, skip/first pages are
+        independent of each other: queries with an entry in QUERY_FRAGMENTS
+        alias `batch_size` pages into a single request, and requests are sent
+        in waves of up to `concurrency` in flight. Results are reassembled in
+        page order, and fetching stops after the first wave containing a
+        short (final) page.
+
         Args:
             query_name: Key in QUERIES dict
             variables: Base query variables
@@ -278,43 +506,180 @@ class AaveGraphClient:
         Returns:
             List of all retrieved entities
         """
+        if query_name in TIMESTAMP_CURSOR_QUERIES:
+            return list(self.iter_with_cursor(query_name, variables, entity_name, max_items, page_size))
+
         all_items = []
         skip = 0
         query = QUERIES[query_name]
+        # Batched documents only declare first/skip variables
+        batch_size = self.batch_size if query_name in QUERY_FRAGMENTS and not variables else 1
+
+        def fetch_batch(batch: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+            if len(batch) == 1:
+                return [self.query(query, batch[0]).get(entity_name, [])]
 
-        while True:
-            if max_items is not None:
-                remaining = max_items - len(all_items)
-                if remaining <= 0:
+            batched_query, batched_variables = build_batched_query(query_name, entity_name, batch)
+            try:
+                data = self.query(batched_query, batched_variables)
+            except ValueError as e:
+                if "complex" not in str(e).lower():
+                    raise
+                # Over the gateway's query complexity limit - one request per page
+                return [self.query(query, page_variables).get(entity_name, []) for page_variables in batch]
+
+            return [data.get(f"p{i}", []) for i in range(len(batch))]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while max_items is None or skip < max_items:
+                # Build the next wave of requests, each covering batch_size pages
+                wave = []
+                for _ in range(self.concurrency * batch_size):
+                    if max_items is not None and skip >= max_items:
+                        break
+                    current_page_size = page_size if max_items is None else min(page_size, max_items - skip)
+                    wave.append({**variables, "first": current_page_size, "skip": skip})
+                    skip += current_page_size
+                batches = [wave[i:i + batch_size] for i in range(0, len(wave), batch_size)]
+
+                logger.debug("Fetching items %d to %d...", wave[0]["skip"], skip)
+
+                finished = False
+                try:
+                    # executor.map yields results in submission (page) order
+                    for batch, pages in zip(batches, executor.map(fetch_batch, batches)):
+                        for page_variables, items in zip(batch, pages):
+                            all_items.extend(items)
+
+                            # A short page means we've reached the end
+                            if len(items) < page_variables["first"]:
+                                finished = True
+                                break
+                        if finished:
+                            break
+                except Exception as e:
+                    logger.error("Error during pagination: %s", e)
                     break
-                current_page_size = min(page_size, remaining)
-            else:
-                current_page_size = page_size
 
-            page_variables = {**variables, "first": current_page_size, "skip": skip}
+                if finished:
+                    break
 
-            print(f"  Fetching items {skip} to {skip + current_page_size}...")
+                time.sleep(self.rate_limit_delay)
 
-            try:
-                data = self.query(query, page_variables)
-                items = data.get(entity_name, [])
+        return all_items
 
-                if not items:
-                    break
+    def iter_with_cursor(
+        self,
+        query_name: str,
+        variables: dict[str, Any],
+        entity_name: str,
+        max_items: Optional[int] = None,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over a query paginated with a timestamp keyset cursor.
+
+        Results are ordered by timestamp descending. Each page asks for rows
+        with `timestamp <= cursor`, where the cursor is the last timestamp of
+        the previous page; ids already returned at that timestamp are excluded
+        via `id_not_in` so rows sharing a timestamp are never duplicated or
+        skipped. Pages depend on each other, so only one is in flight at a
+        time, but the request for page N+1 is sent on a background thread as
+        soon as page N has arrived, so the caller's formatting and writing of
+        page N overlaps the network wait for the next one.
 
-                all_items.extend(items)
-                skip += len(items)
+        Args:
+            query_name: Key in QUERIES dict
+            variables: Base query variables, including the initial "cursor"
+                (upper timestamp bound)
+            entity_name: Name of the entity list in response
+            max_items: Maximum items to retrieve
+            page_size: Items per page (The Graph allows up to 1000)
 
-                if len(items) < current_page_size:
+        Yields:
+            Retrieved entities, newest first
+        """
+        query = QUERIES[query_name]
+        cursor = variables["cursor"]
+        start_time = int(variables.get("startTime") or 0)
+        seen_ids: list[str] = []
+        total = 0
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_request_at = time.monotonic()
+
+            def submit_page() -> Optional[tuple[int, Any]]:
+                """Submit the fetch for the page after `total`, if one is wanted."""
+                nonlocal next_request_at
+                if max_items is not None:
+                    remaining = max_items - total
+                    if remaining <= 0:
+                        return None
+                    current_page_size = min(page_size, remaining)
+                else:
+                    current_page_size = page_size
+
+                page_variables = {**variables, "first": current_page_size, "cursor": cursor, "seenIds": seen_ids}
+
+                logger.debug("Fetching items %d to %d...", total, total + current_page_size)
+
+                # Space request start times at least rate_limit_delay apart
+                start_at = max(next_request_at, time.monotonic())
+                next_request_at = start_at + self.rate_limit_delay
+                future = executor.submit(self._fetch_page, query, page_variables, entity_name, start_at)
+                return current_page_size, future
+
+            pending = submit_page()
+            while pending is not None:
+                current_page_size, future = pending
+                pending = None
+
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logger.error("Error during pagination: %s", e)
                     break
 
-                time.sleep(self.rate_limit_delay)
+                # The server applies timestamp_gte, so this should not happen;
+                # but should a page run past the lower bound, no later page
+                # (ordered newest first) can be in range, so drop the overshoot
+                # and stop rather than paging through older history
+                if items and int(items[-1]["timestamp"]) < start_time:
+                    items = [item for item in items if int(item["timestamp"]) >= start_time]
+                    current_page_size = None
 
-            except Exception as e:
-                print(f"  Error during pagination: {e}")
-                break
+                total += len(items)
 
-        return all_items
+                # A full page means there may be more; advance the cursor and
+                # request the next page before handing this one to the caller
+                if len(items) == current_page_size:
+                    last_timestamp = items[-1]["timestamp"]
+                    tail_ids = [item["id"] for item in items if item["timestamp"] == last_timestamp]
+
+                    # Keep accumulating ids if we're still on the same
+                    # timestamp (bursts larger than one page)
+                    if last_timestamp == cursor:
+                        seen_ids = seen_ids + tail_ids
+                    else:
+                        cursor = last_timestamp
+                        seen_ids = tail_ids
+
+                    pending = submit_page()
+
+                yield from items
+
+    def _fetch_page(
+        self,
+        query: str,
+        variables: dict[str, Any],
+        entity_name: str,
+        not_before: float,
+    ) -> list[dict[str, Any]]:
+        """Fetch one page, waiting until `not_before` (time.monotonic) to honour the rate limit."""
+        delay = not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return self.query(query, variables).get(entity_name, [])
 
 
 # =============================================================================
@@ -336,6 +701,32 @@ def format_liquidation(liq: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Formatted liquidation dictionary
     """
+    # Straight-line fast path: the query selects every field, so the keys
+    # are present and can be indexed directly rather than through .get()
+    try:
+        timestamp = int(liq["timestamp"])
+        user = liq["user"]
+        reserve = liq["reserve"]
+        return {
+            "id": liq["id"],
+            "timestamp": timestamp,
+            "datetime": datetime.fromtimestamp(timestamp).isoformat() if timestamp else None,
+            "user": user["id"] if user else None,
+            "health_factor": int(user["healthFactor"]) if user else 0,
+            "reserve_id": reserve["id"] if reserve else None,
+            "reserve_underlying_asset": reserve["underlyingAsset"] if reserve else None,
+            "collateral_asset": liq["collateralAsset"],
+            "debt_asset": liq["debtAsset"],
+            "debt_to_cover": int(liq["debtToCover"]),
+            "liquidated_collateral_amount": int(liq["liquidatedCollateralAmount"]),
+            "profit": int(liq["profit"]),
+        }
+    except KeyError:
+        return _format_partial_liquidation(liq)
+
+
+def _format_partial_liquidation(liq: dict[str, Any]) -> dict[str, Any]:
+    """Format a liquidation record with missing fields (see format_liquidation)."""
     timestamp = int(liq.get("timestamp", 0))
     reserve = liq.get("reserve", {}) or {}
     user = liq.get("user", {}) or {}
@@ -362,6 +753,30 @@ def format_liquidation(liq: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+# Formatted liquidation fields holding addresses. A few dozen assets and a
+# long tail of repeat users account for most rows, so callers that keep
+# records (download_liquidations, format_liquidations_soa) hold one shared
+# string object per distinct value instead of one per row.
+ADDRESS_FIELDS = ("user", "reserve_id", "reserve_underlying_asset", "collateral_asset", "debt_asset")
+
+
+def intern_addresses(records: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """
+    Deduplicate the address strings (see ADDRESS_FIELDS) of formatted records.
+
+    Args:
+        records: Formatted liquidation records, modified in place
+
+    Yields:
+        The same records, with equal addresses sharing one string object
+    """
+    intern_address = {}.setdefault
+    for record in records:
+        for key in ADDRESS_FIELDS:
+            record[key] = intern_address(record[key], record[key])
+        yield record
+
+
 def format_reserve(reserve: dict[str, Any]) -> dict[str, Any]:
     """
     Format a raw reserve record.
@@ -378,19 +793,185 @@ def format_reserve(reserve: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+# Parquet rows buffered per bulk-format/write call
+PARQUET_CHUNK_ROWS = 100_000
+
+
+if pa is not None:
+    # Shape of a raw liquidation as selected by QUERIES["liquidations_all"]
+    RAW_LIQUIDATION_SCHEMA = pa.schema([
+        ("id", pa.string()),
+        ("timestamp", pa.string()),
+        ("user", pa.struct([("id", pa.string()), ("healthFactor", pa.string())])),
+        ("reserve", pa.struct([("id", pa.string()), ("underlyingAsset", pa.string())])),
+        ("collateralAsset", pa.string()),
+        ("debtAsset", pa.string()),
+        ("debtToCover", pa.string()),
+        ("liquidatedCollateralAmount", pa.string()),
+        ("profit", pa.string()),
+    ])
+
+
+# Column dtypes for to_soa; columns not listed are stored as object arrays.
+# BigInt columns stay object so they keep Python's arbitrary-precision ints.
+SOA_DTYPES = {
+    "timestamp": "int64",
+}
+
+
+def to_soa(records: Iterable[dict[str, Any]]) -> dict[str, "np.ndarray"]:
+    """
+    Convert formatted records (array of structs) into a struct of arrays.
+
+    Iterates once, appending each field to a per-column list, then converts
+    each column with an explicit dtype. Numeric columns like `timestamp` take
+    8 bytes per value instead of a Python object each, and column arrays can
+    be scanned directly with NumPy.
+
+    Args:
+        records: Formatted records sharing the same keys
+
+    Returns:
+        Dictionary mapping column name to a 1-D NumPy array
+    """
+    columns: dict[str, list[Any]] = {}
+    for record in records:
+        if not columns:
+            columns = {key: [] for key in record}
+        for key, column in columns.items():
+            column.append(record.get(key))
+
+    return {key: np.asarray(values, dtype=SOA_DTYPES.get(key, object)) for key, values in columns.items()}
+
+
+def format_liquidations_soa(liquidations: list[dict[str, Any]]) -> dict[str, "np.ndarray"]:
+    """
+    Format raw liquidation records directly into column arrays.
+
+    Equivalent to `to_soa(map(format_liquidation, liquidations))`, but
+    without building an intermediate dict per row: raw values are collected
+    per column in one pass and converted column-at-a-time. Timestamp strings
+    are parsed to int64 by NumPy in C; BigInt strings are converted with a
+    single `map(int, ...)` per column, since NumPy has no integer dtype wide
+    enough to hold them. Repeated address strings are deduplicated (see
+    ADDRESS_FIELDS).
+
+    Args:
+        liquidations: Raw liquidation data from subgraph
+
+    Returns:
+        Dictionary mapping column name to a 1-D NumPy array
+    """
+    # Canonical copy of each address string seen so far
+    intern_address = {}.setdefault
+
+    raw_columns: dict[str, list[Any]] = {
+        "id": [], "timestamp": [], "user": [], "health_factor": [],
+        "reserve_id": [], "reserve_underlying_asset": [], "collateral_asset": [],
+        "debt_asset": [], "debt_to_cover": [], "liquidated_collateral_amount": [], "profit": [],
+    }
+    for liq in liquidations:
+        user = liq.get("user") or {}
+        reserve = liq.get("reserve") or {}
+        raw_columns["id"].append(liq.get("id"))
+        raw_columns["timestamp"].append(liq.get("timestamp") or "0")
+        raw_columns["health_factor"].append(user.get("healthFactor") or "0")
+        raw_columns["debt_to_cover"].append(liq.get("debtToCover") or "0")
+        raw_columns["liquidated_collateral_amount"].append(liq.get("liquidatedCollateralAmount") or "0")
+        raw_columns["profit"].append(liq.get("profit") or "0")
+        for key, address in (
+            ("user", user.get("id")),
+            ("reserve_id", reserve.get("id")),
+            ("reserve_underlying_asset", reserve.get("underlyingAsset")),
+            ("collateral_asset", liq.get("collateralAsset")),
+            ("debt_asset", liq.get("debtAsset")),
+        ):
+            raw_columns[key].append(intern_address(address, address))
+
+    timestamps = np.asarray(raw_columns.pop("timestamp"), dtype=np.int64)
+    datetimes = [datetime.fromtimestamp(ts).isoformat() if ts else None for ts in timestamps.tolist()]
+
+    columns = {
+        "id": np.asarray(raw_columns["id"], dtype=object),
+        "timestamp": timestamps,
+        "datetime": np.asarray(datetimes, dtype=object),
+    }
+    for key, values in raw_columns.items():
+        if key in ("id", "timestamp"):
+            continue
+        if key in ("health_factor", "debt_to_cover", "liquidated_collateral_amount", "profit"):
+            values = list(map(int, values))
+        columns[key] = np.asarray(values, dtype=object)
+
+    return columns
+
+
+def _cast_amounts(values: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """
+    Cast BigInt strings to decimal128(38, 0) in one vectorized pass.
+
+    A plain cast raises ArrowInvalid for values of 39 or more digits; those
+    become null instead.
+    """
+    too_large = pc.match_substring_regex(values, r"^-?\d{39,}")
+    values = pc.if_else(too_large, pa.scalar(None, pa.string()), values)
+    return pc.cast(values, pa.decimal128(38, 0))
+
+
+def format_liquidations_bulk(liquidations: list[dict[str, Any]]) -> "pa.Table":
+    """
+    Format raw liquidation records into an Arrow table in bulk.
+
+    Produces the same columns as format_liquidation, but all conversions run
+    as Arrow compute kernels over whole columns instead of per-row Python:
+    BigInt strings are cast to decimal128(38, 0), timestamps to int64 plus a
+    UTC timestamp column, and the nested user/reserve structs are flattened.
+
+    `health_factor` is cast to float64 rather than decimal: users without
+    debt carry max uint256, which doesn't fit in decimal128. Amounts of 10^38
+    or more don't fit either; they are stored as null (see _cast_amounts)
+    rather than failing the whole chunk, since no real position is that large.
+
+    Args:
+        liquidations: Raw liquidation data from subgraph
+
+    Returns:
+        pyarrow Table with one row per liquidation
+    """
+    raw = pa.Table.from_pylist(liquidations, schema=RAW_LIQUIDATION_SCHEMA)
+    user = raw.column("user")
+    reserve = raw.column("reserve")
+    timestamp = pc.cast(raw.column("timestamp"), pa.int64())
+
+    return pa.table({
+        "id": raw.column("id"),
+        "timestamp": timestamp,
+        "datetime": pc.cast(timestamp, pa.timestamp("s", tz="UTC")),
+        "user": pc.struct_field(user, "id"),
+        "health_factor": pc.cast(pc.struct_field(user, "healthFactor"), pa.float64()),
+        "reserve_id": pc.struct_field(reserve, "id"),
+        "reserve_underlying_asset": pc.struct_field(reserve, "underlyingAsset"),
+        "collateral_asset": raw.column("collateralAsset"),
+        "debt_asset": raw.column("debtAsset"),
+        "debt_to_cover": _cast_amounts(raw.column("debtToCover")),
+        "liquidated_collateral_amount": _cast_amounts(raw.column("liquidatedCollateralAmount")),
+        "profit": _cast_amounts(raw.column("profit")),
+    })
+
+
 # =============================================================================
 # DOWNLOAD FUNCTIONS
 # =============================================================================
 
-def download_liquidations(
+def iter_raw_liquidations(
     client: AaveGraphClient,
-    limit: int = 100,
+    limit: Optional[int] = 100,
     user: Optional[str] = None,
     start_time: Optional[int] = None,
     end_time: Optional[int] = None,
-) -> list[dict[str, Any]]:
+) -> Iterator[dict[str, Any]]:
     """
-    Download liquidation events.
+    Stream raw (unformatted) liquidation events, newest first.
 
     Args:
         client: AaveGraphClient instance
@@ -400,7 +981,7 @@ def download_liquidations(
         end_time: Optional end timestamp
 
     Returns:
-        List of formatted liquidation records
+        Iterator of raw liquidation records as returned by the subgraph
     """
     effective_start = start_time if start_time is not None else 0
     effective_end = end_time if end_time is not None else 9999999999
@@ -415,29 +996,81 @@ def download_liquidations(
             time_filter = f" before {datetime.fromtimestamp(end_time)}"
 
     if user:
-        print(f"\nDownloading {limit} liquidations for user {user}{time_filter}...")
+        logger.info("Downloading %s liquidations for user %s%s...", limit, user, time_filter)
         query_name = "liquidations"
         variables = {
             "user": user.lower(),
             "startTime": str(effective_start),
-            "endTime": str(effective_end),
+            "cursor": str(effective_end),  # Upper bound; advanced by the paginator
         }
     else:
-        print(f"\nDownloading {limit} recent liquidations{time_filter}...")
+        logger.info("Downloading %s recent liquidations%s...", limit, time_filter)
         query_name = "liquidations_all"
         variables = {
             "startTime": str(effective_start),
-            "endTime": str(effective_end),
+            "cursor": str(effective_end),  # Upper bound; advanced by the paginator
         }
 
-    liquidations = client.query_with_pagination(
+    return client.iter_with_cursor(
         query_name,
         variables,
         entity_name="liquidations",
         max_items=limit,
     )
 
-    return [format_liquidation(l) for l in liquidations]
+
+def iter_liquidations(
+    client: AaveGraphClient,
+    limit: Optional[int] = 100,
+    user: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream formatted liquidation events, newest first.
+
+    Records are formatted as they arrive, so they can be written straight to
+    disk (see save_to_json) without holding the whole download in memory.
+
+    Args:
+        client: AaveGraphClient instance
+        limit: Maximum number of liquidations
+        user: Optional user address to filter
+        start_time: Optional start timestamp
+        end_time: Optional end timestamp
+
+    Returns:
+        Iterator of formatted liquidation records
+    """
+    liquidations = iter_raw_liquidations(client, limit=limit, user=user, start_time=start_time, end_time=end_time)
+    return map(format_liquidation, liquidations)
+
+
+def download_liquidations(
+    client: AaveGraphClient,
+    limit: Optional[int] = 100,
+    user: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """
+    Download liquidation events.
+
+    Records are formatted as pages arrive and their addresses deduplicated
+    (see intern_addresses), so only the formatted list is held in memory.
+
+    Args:
+        client: AaveGraphClient instance
+        limit: Maximum number of liquidations
+        user: Optional user address to filter
+        start_time: Optional start timestamp
+        end_time: Optional end timestamp
+
+    Returns:
+        List of formatted liquidation records
+    """
+    liquidations = iter_liquidations(client, limit=limit, user=user, start_time=start_time, end_time=end_time)
+    return list(intern_addresses(liquidations))
 
 
 def download_reserves(
@@ -454,7 +1087,7 @@ def download_reserves(
     Returns:
         List of formatted reserve records
     """
-    print(f"\nDownloading reserve data...")
+    logger.info("Downloading reserve data...")
 
     reserves = client.query_with_pagination(
         "reserves",
@@ -470,6 +1103,11 @@ def download_reserves(
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Shapes accepted by parse_timestamp's fast path
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}$")
+
+
 def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
     """
     Parse a time string into a Unix timestamp.
@@ -478,10 +1116,28 @@ def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
     - Unix timestamp (integer string): "1704067200"
     - ISO date: "2024-01-01"
     - ISO datetime: "2024-01-01T12:00:00"
+
+    The common shapes are recognized with precompiled regexes and built with
+    the datetime constructor directly, which is ~10x faster than strptime.
+    strptime is kept as a fallback for looser inputs (e.g., "2024-1-1").
     """
     if time_str is None:
         return None
 
+    try:
+        if _DATE_RE.match(time_str):
+            dt = datetime(int(time_str[:4]), int(time_str[5:7]), int(time_str[8:10]))
+            return int(dt.timestamp())
+        if _DATETIME_RE.match(time_str):
+            dt = datetime(
+                int(time_str[:4]), int(time_str[5:7]), int(time_str[8:10]),
+                int(time_str[11:13]), int(time_str[14:16]), int(time_str[17:19]),
+            )
+            return int(dt.timestamp())
+    except ValueError:
+        # Right shape but out-of-range fields (e.g., month 13)
+        pass
+
     try:
         return int(time_str)
     except ValueError:
@@ -523,17 +1179,134 @@ def get_data_directory(subgraph: str, query_type: str, base_dir: Optional[str] =
     return data_dir
 
 
-def save_to_json(data: list[dict], filepath: str) -> None:
-    """Save data to a JSON file."""
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    print(f"Saved {len(data)} records to {filepath}")
+# Write buffer for JSON/JSONL output files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def open_output(filepath: str) -> Iterator[Any]:
+    """
+    Open an output file for binary writing, zstd-compressing if it ends in .zst.
+
+    Writes are buffered in OUTPUT_BUFFER_SIZE blocks, so the many small
+    per-record writes of save_to_json/save_to_jsonl reach the OS as a few
+    large ones.
+
+    Yields:
+        A writable binary file object
+    """
+    with open(filepath, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+        if filepath.endswith(".zst"):
+            with zstandard.ZstdCompressor().stream_writer(f, closefd=False) as compressed:
+                yield compressed
+        else:
+            yield f
+
+
+def save_to_json(data: Iterable[dict], filepath: str) -> int:
+    """
+    Save records to a JSON array file.
+
+    Records are serialized and written one at a time, so `data` may be a
+    generator (e.g., from iter_liquidations) that is never fully in memory.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open_output(filepath) as f:
+        f.write(b"[")
+        for record in data:
+            f.write(b",\n  " if count else b"\n  ")
+            # Indent each record's lines to match a pretty-printed array
+            f.write(_stdlib_dumps(record, indent=True).replace(b"\n", b"\n  "))
+            count += 1
+        f.write(b"\n]" if count else b"]")
+    logger.info("Saved %d records to %s", count, filepath)
+    return count
+
+
+def save_to_jsonl(data: Iterable[dict], filepath: str) -> int:
+    """
+    Save records as newline-delimited JSON (one compact record per line).
+
+    Records are written as they are produced, so memory use stays constant
+    per record. JSONL loads directly with pandas `read_json(lines=True)` and
+    DuckDB `read_json_auto`.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open_output(filepath) as f:
+        for record in data:
+            f.write(_stdlib_dumps(record, indent=False))
+            f.write(b"\n")
+            count += 1
+    logger.info("Saved %d records to %s", count, filepath)
+    return count
+
+
+def save_to_parquet(tables: Iterable["pa.Table"], filepath: str) -> int:
+    """
+    Save Arrow tables to a single zstd-compressed Parquet file.
+
+    Tables are written as they are produced, one row group each, so a
+    generator of chunks never needs to be fully in memory.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    writer = None
+    try:
+        for table in tables:
+            if writer is None:
+                writer = pq.ParquetWriter(filepath, table.schema, compression="zstd")
+            writer.write_table(table)
+            count += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    logger.info("Saved %d records to %s", count, filepath)
+    return count
+
+
+def save_to_npz(columns: dict[str, "np.ndarray"], filepath: str) -> int:
+    """
+    Save column arrays (see to_soa) as a compressed NumPy archive.
+
+    Object columns are pickled inside the archive, so load with
+    `np.load(filepath, allow_pickle=True)`.
+
+    Returns:
+        Number of records written
+    """
+    count = len(next(iter(columns.values()))) if columns else 0
+    np.savez_compressed(filepath, **columns)
+    logger.info("Saved %d records to %s", count, filepath)
+    return count
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split an iterable into lists of `size` items (always at least one list)."""
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, size))
+    yield chunk
+    while len(chunk) == size:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            break
+        yield chunk
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
+OUTPUT_FORMATS = ["json", "jsonl", "parquet", "npz"]
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -606,7 +1379,21 @@ Examples:
         "--output",
         type=str,
         default=None,
-        help="Output JSON filename (default: auto-generated)",
+        help="Output filename (default: auto-generated)",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        default=None,
+        choices=OUTPUT_FORMATS,
+        help="Output format (default: from --output suffix, else jsonl if --limit > 10000, else json)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="zstd-compress json/jsonl output, adding a .zst suffix (requires zstandard)",
     )
 
     parser.add_argument(
@@ -616,6 +1403,33 @@ Examples:
         help="Base output directory (default: ./data)",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of page requests in flight at once (default: 4)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5,
+        help="Pages aliased into one request for skip-paginated queries (default: 5)",
+    )
+
+    parser.add_argument(
+        "--persisted-queries",
+        action="store_true",
+        help="Send query hashes instead of full queries (Automatic Persisted Queries; needs gateway support)",
+    )
+
+    parser.add_argument(
+        "-v", "--verbose",
+        action="count",
+        default=0,
+        help="Also log every page request",
+    )
+
     parser.add_argument(
         "--list-subgraphs",
         action="store_true",
@@ -631,6 +1445,11 @@ Examples:
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(message)s",
+    )
+
     # Handle --list-subgraphs
     if args.list_subgraphs:
         print("\nAvailable AAVE Subgraphs:")
@@ -650,7 +1469,13 @@ Examples:
     print(f"\nConnecting to {config.name}...")
 
     try:
-        client = AaveGraphClient(config, api_key=args.api_key)
+        client = AaveGraphClient(
+            config,
+            api_key=args.api_key,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            persisted_queries=args.persisted_queries,
+        )
     except ValueError as e:
         print(f"\nError: {e}")
         return
@@ -665,9 +1490,80 @@ Examples:
         print(f"\nError: {e}")
         return
 
-    # Execute query
+    # Determine output format: explicit flag, else the --output suffix, else
+    # JSONL for large downloads (streams with constant memory) and JSON otherwise
+    output_format = args.format
+    if output_format is None:
+        output_name = args.output.removesuffix(".zst") if args.output else ""
+        suffix = os.path.splitext(output_name)[1].lstrip(".")
+        if suffix in OUTPUT_FORMATS:
+            output_format = suffix
+        else:
+            output_format = "jsonl" if args.limit > 10000 else "json"
+
+    # Determine output path
+    if args.output:
+        output_file = args.output
+    else:
+        data_dir = get_data_directory(args.subgraph, args.query_type, base_dir=args.output_dir)
+        output_file = os.path.join(data_dir, f"data.{output_format}")
+
+    if args.compress and output_format in ("json", "jsonl") and not output_file.endswith(".zst"):
+        output_file += ".zst"
+
+    if output_file.endswith(".zst") and zstandard is None:
+        print("\nError: .zst output requires zstandard (pip install zstandard)")
+        return
+
+    if output_format == "parquet":
+        if pa is None:
+            print("\nError: Parquet output requires pyarrow (pip install pyarrow)")
+            return
+
+        # Raw liquidations are formatted column-wise in chunks by Arrow
+        if args.query_type == "liquidations":
+            raw_records = iter_raw_liquidations(
+                client,
+                limit=args.limit,
+                user=args.user,
+                start_time=start_time,
+                end_time=end_time,
+            )
+            tables = map(format_liquidations_bulk, chunked(raw_records, PARQUET_CHUNK_ROWS))
+        else:
+            tables = [pa.Table.from_pylist(download_reserves(client, limit=args.limit))]
+
+        count = save_to_parquet(tables, output_file)
+        print(f"\nDownloaded {count} {args.query_type}")
+        print("\nDone!")
+        return
+
+    if output_format == "npz":
+        if np is None:
+            print("\nError: npz output requires numpy (pip install numpy)")
+            return
+
+        # Raw liquidations are converted straight into column arrays
+        if args.query_type == "liquidations":
+            raw_records = iter_raw_liquidations(
+                client,
+                limit=args.limit,
+                user=args.user,
+                start_time=start_time,
+                end_time=end_time,
+            )
+            columns = format_liquidations_soa(list(raw_records))
+        else:
+            columns = to_soa(download_reserves(client, limit=args.limit))
+
+        count = save_to_npz(columns, output_file)
+        print(f"\nDownloaded {count} {args.query_type}")
+        print("\nDone!")
+        return
+
+    # Execute query. Liquidations are streamed through to the output file.
     if args.query_type == "liquidations":
-        data = download_liquidations(
+        records = iter_liquidations(
             client,
             limit=args.limit,
             user=args.user,
@@ -675,26 +1571,23 @@ Examples:
             end_time=end_time,
         )
     elif args.query_type == "reserves":
-        data = download_reserves(client, limit=args.limit)
+        records = iter(download_reserves(client, limit=args.limit))
     else:
         print(f"Unknown query type: {args.query_type}")
         return
 
-    # Print summary
-    print(f"\nDownloaded {len(data)} {args.query_type}")
-
-    if data:
+    # Peek at the first record for the sample printout
+    first = next(records, None)
+    if first is not None:
         print("\nSample record:")
-        print(json.dumps(data[0], indent=2, default=str))
+        print(json.dumps(first, indent=2, default=str))
+        records = itertools.chain([first], records)
 
-    # Determine output path
-    if args.output:
-        output_file = args.output
-    else:
-        data_dir = get_data_directory(args.subgraph, args.query_type, base_dir=args.output_dir)
-        output_file = os.path.join(data_dir, "data.json")
+    save = save_to_jsonl if output_format == "jsonl" else save_to_json
+    count = save(records, output_file)
 
-    save_to_json(data, output_file)
+    # Print summary
+    print(f"\nDownloaded {count} {args.query_type}")
 
     print("\nDone!")
 
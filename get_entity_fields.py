@@ -5,6 +5,12 @@ import sys
 import json
 import requests
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 def main():
     api_key = os.environ.get('GRAPH_API_KEY')
     if not api_key:
@@ -36,7 +42,7 @@ def main():
     }}
     '''
     response = requests.post(url, json={'query': query})
-    data = response.json()
+    data = _loads(response.content)
 
     if 'errors' in data:
         print(f'Errors: {data["errors"]}')
@@ -2,8 +2,15 @@
 """Quick script to fetch available query fields from a subgraph."""
 import os
 import sys
+import json
 import requests
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 def main():
     api_key = os.environ.get('GRAPH_API_KEY')
     if not api_key:
@@ -17,7 +24,7 @@ def main():
     # Get all query fields
     query = '{ __schema { queryType { fields { name } } } }'
     response = requests.post(url, json={'query': query})
-    data = response.json()
+    data = _loads(response.content)
 
     if 'errors' in data:
         print(f'Errors: {data["errors"]}')
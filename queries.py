@@ -3,20 +3,26 @@ Query configurations and constants for The Graph DEX data downloader.
 
 This module contains:
 - SubgraphConfig: Dataclass for subgraph endpoint configuration
-- SUBGRAPH_CONFIGS: Dictionary of available DEX subgraph configurations
+- SUBGRAPH_CONFIGS: Dictionary of available DEX subgraph configurations,
+  keyed by short name
 - QUERIES_V3: GraphQL queries for V3 DEXes (Uniswap V3, PancakeSwap V3)
 - QUERIES_V2: GraphQL queries for V2 DEXes (PancakeSwap V2)
-- Helper functions for query selection
+- ID_CURSOR_QUERIES / TIMESTAMP_CURSOR_QUERIES: Queries paginated by keyset
+  cursor instead of skip
+- Helper functions for query selection, multi-pool query batching and URL
+  resolution
 """
 
-from dataclasses import dataclass
+import functools
+import re
+from dataclasses import dataclass, field
 
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SubgraphConfig:
     """
     Configuration for a Graph Protocol subgraph endpoint.
@@ -29,6 +35,8 @@ class SubgraphConfig:
         url: The GraphQL endpoint URL for the subgraph
         description: Brief description of what this subgraph indexes
         dex_type: The DEX type for query schema selection ("uniswap_v3", "sushiswap_v3", "pancakeswap_v3", "sushiswap_v2")
+        is_v2: Whether dex_type uses the V2 schema (pairs instead of pools);
+            derived from dex_type
 
     Example:
         >>> config = SubgraphConfig(
@@ -42,6 +50,16 @@ class SubgraphConfig:
     url: str
     description: str
     dex_type: str = "uniswap_v3"  # Default to Uniswap V3 schema
+    is_v2: bool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Resolved once here rather than on every page request
+        object.__setattr__(self, "is_v2", self.dex_type.endswith("_v2"))
+
+    @property
+    def queries(self) -> dict[str, str]:
+        """The query set for this subgraph's schema (QUERIES_V2 or QUERIES_V3)."""
+        return QUERIES_V2 if self.is_v2 else QUERIES_V3
 
 
 # Subgraph endpoints for various DEXes
@@ -58,54 +76,54 @@ class SubgraphConfig:
 # Base URL for The Graph decentralized network
 GRAPH_BASE_URL = "https://gateway.thegraph.com/api/{api_key}/subgraphs/id/"
 
-SUBGRAPH_CONFIGS = {
+_CONFIGS = (
     # =========================================================================
     # UNISWAP V3
     # Schema: Standard Uniswap V3 subgraph schema
     # =========================================================================
-    "uniswap_v3_ethereum": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Ethereum",
         url=GRAPH_BASE_URL + "5zvR82QoaXYFyDEKLZ9t6v9adgnptxYpKpSbxtgVENFV",
         description="Uniswap V3 protocol on Ethereum mainnet",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_arbitrum": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Arbitrum",
         url=GRAPH_BASE_URL + "FbCGRftH4a3yZugY7TnbYgPJVEv2LvMT6oF1fxPe9aJM",
         description="Uniswap V3 protocol on Arbitrum One",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_polygon": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Polygon",
         url=GRAPH_BASE_URL + "3hCPRGf4z88VC5rsBKU5AA9FBBq5nF3jbKJG7VZCbhjm",
         description="Uniswap V3 protocol on Polygon",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_base": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Base",
         url=GRAPH_BASE_URL + "43Hwfi3dJSoGpyas9VwNoDAv55yjgGrPpNSmbQZArzMG",
         description="Uniswap V3 protocol on Base",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_optimism": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Optimism",
         url=GRAPH_BASE_URL + "Cghf4LfVqPiFw6fp6Y5X5Ubc8UpmUhSfJL82zwiBFLaj",
         description="Uniswap V3 protocol on Optimism",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_celo": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Celo",
         url=GRAPH_BASE_URL + "ESdrTJ3twMwWVoQ1hUE2u7PugEHX3QkenudD6aXCkDQ4",
         description="Uniswap V3 protocol on Celo",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_avalanche": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 Avalanche",
         url=GRAPH_BASE_URL + "GVH9h9KZ9CqheUEL93qMbq7QwgoBu32QXQDPR6bev4Eo",
         description="Uniswap V3 protocol on Avalanche",
         dex_type="uniswap_v3"
     ),
-    "uniswap_v3_bsc": SubgraphConfig(
+    SubgraphConfig(
         name="Uniswap V3 BSC",
         url=GRAPH_BASE_URL + "F85MNzUGYqgSHSHRGgeVMNsdnW1KtZSVgFULumXRZTw2",
         description="Uniswap V3 protocol on BNB Smart Chain",
@@ -117,43 +135,43 @@ SUBGRAPH_CONFIGS = {
     # Schema: Similar to Uniswap V3 (forked)
     # Source: https://developer.pancakeswap.finance/apis/subgraph
     # =========================================================================
-    "pancakeswap_v3_bsc": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 BSC",
         url=GRAPH_BASE_URL + "Hv1GncLY5docZoGtXjo4kwbTvxm3MAhVZqBZE4sUT9eZ",
         description="PancakeSwap V3 on BNB Smart Chain",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_ethereum": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 Ethereum",
         url=GRAPH_BASE_URL + "CJYGNhb7RvnhfBDjqpRnD3oxgyhibzc7fkAMa38YV3oS",
         description="PancakeSwap V3 on Ethereum mainnet",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_arbitrum": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 Arbitrum",
         url=GRAPH_BASE_URL + "251MHFNN1rwjErXD2efWMpNS73SANZN8Ua192zw6iXve",
         description="PancakeSwap V3 on Arbitrum One",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_polygon_zkevm": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 Polygon zkEVM",
         url=GRAPH_BASE_URL + "7HroSeAFxfJtYqpbgcfAnNSgkzzcZXZi6c75qLPheKzQ",
         description="PancakeSwap V3 on Polygon zkEVM",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_zksync": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 zkSync",
         url=GRAPH_BASE_URL + "3dKr3tYxTuwiRLkU9vPj3MvZeUmeuGgWURbFC72ZBpYY",
         description="PancakeSwap V3 on zkSync Era",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_linea": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 Linea",
         url=GRAPH_BASE_URL + "6gCTVX98K3A9Hf9zjvgEKwjz7rtD4C1V173RYEdbeMFX",
         description="PancakeSwap V3 on Linea",
         dex_type="pancakeswap_v3"
     ),
-    "pancakeswap_v3_base": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V3 Base",
         url=GRAPH_BASE_URL + "BHWNsedAHtmTCzXxCCDfhPmm6iN9rxUhoRHdHKyujic3",
         description="PancakeSwap V3 on Base",
@@ -164,43 +182,46 @@ SUBGRAPH_CONFIGS = {
     # PANCAKESWAP V2 (StableSwap)
     # Schema: Uses "pairs" similar to Uniswap V2/SushiSwap V2
     # =========================================================================
-    "pancakeswap_v2_ethereum": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 Ethereum",
         url=GRAPH_BASE_URL + "9opY17WnEPD4REcC43yHycQthSeUMQE26wyoeMjZTLEx",
         description="PancakeSwap V2 on Ethereum mainnet",
         dex_type="pancakeswap_v2"
     ),
-    "pancakeswap_v2_arbitrum": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 Arbitrum",
         url=GRAPH_BASE_URL + "EsL7geTRcA3LaLLM9EcMFzYbUgnvf8RixoEEGErrodB3",
         description="PancakeSwap V2 on Arbitrum One",
         dex_type="pancakeswap_v2"
     ),
-    "pancakeswap_v2_polygon_zkevm": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 Polygon zkEVM",
         url=GRAPH_BASE_URL + "37WmH5kBu6QQytRpMwLJMGPRbXvHgpuZsWqswW4Finc2",
         description="PancakeSwap V2 on Polygon zkEVM",
         dex_type="pancakeswap_v2"
     ),
-    "pancakeswap_v2_zksync": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 zkSync",
         url=GRAPH_BASE_URL + "6dU6WwEz22YacyzbTbSa3CECCmaD8G7oQ8aw6MYd5VKU",
         description="PancakeSwap V2 on zkSync Era",
         dex_type="pancakeswap_v2"
     ),
-    "pancakeswap_v2_linea": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 Linea",
         url=GRAPH_BASE_URL + "Eti2Z5zVEdARnuUzjCbv4qcimTLysAizsqH3s6cBfPjB",
         description="PancakeSwap V2 on Linea",
         dex_type="pancakeswap_v2"
     ),
-    "pancakeswap_v2_base": SubgraphConfig(
+    SubgraphConfig(
         name="PancakeSwap V2 Base",
         url=GRAPH_BASE_URL + "2NjL7L4CmQaGJSacM43ofmH6ARf6gJoBeBaJtz9eWAQ9",
         description="PancakeSwap V2 on Base",
         dex_type="pancakeswap_v2"
     ),
-}
+)
+
+# Lookup by short name, e.g. "uniswap_v3_ethereum"
+SUBGRAPH_CONFIGS = {config.name.lower().replace(" ", "_"): config for config in _CONFIGS}
 
 
 # =============================================================================
@@ -252,59 +273,33 @@ QUERIES_V3 = {
     """,
 
     "swaps": """
-    query GetSwaps($first: Int!, $skip: Int!, $poolId: String, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt) {
+    query GetSwaps($first: Int!, $poolId: String, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt, $seenIds: [String!]) {
         swaps(
             first: $first
-            skip: $skip
             where: {
                 pool_: { id: $poolId }
                 amountUSD_gte: $minAmountUSD
                 timestamp_gte: $startTime
                 timestamp_lte: $endTime
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
         ) {
-            id
-            transaction {
-                id
-                blockNumber
-                timestamp
-                gasUsed
-                gasPrice
-            }
-            timestamp
-            pool {
-                id
-                token0 {
-                    symbol
-                }
-                token1 {
-                    symbol
-                }
-            }
-            sender
-            recipient
-            origin
-            amount0
-            amount1
-            amountUSD
-            sqrtPriceX96
-            tick
-            logIndex
+            ...SwapFields
         }
     }
     """,
 
     "swaps_all": """
-    query GetSwapsAll($first: Int!, $skip: Int!, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt) {
+    query GetSwapsAll($first: Int!, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt, $seenIds: [String!]) {
         swaps(
             first: $first
-            skip: $skip
             where: {
                 amountUSD_gte: $minAmountUSD
                 timestamp_gte: $startTime
                 timestamp_lte: $endTime
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
@@ -437,56 +432,33 @@ QUERIES_V2 = {
     """,
 
     "swaps": """
-    query GetSwaps($first: Int!, $skip: Int!, $pairId: String, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt) {
+    query GetSwaps($first: Int!, $pairId: String, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt, $seenIds: [String!]) {
         swaps(
             first: $first
-            skip: $skip
             where: {
                 pair_: { id: $pairId }
                 amountUSD_gte: $minAmountUSD
                 timestamp_gte: $startTime
                 timestamp_lte: $endTime
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
         ) {
-            id
-            transaction {
-                id
-                blockNumber
-                timestamp
-            }
-            timestamp
-            pair {
-                id
-                token0 {
-                    symbol
-                }
-                token1 {
-                    symbol
-                }
-            }
-            sender
-            to
-            amount0In
-            amount1In
-            amount0Out
-            amount1Out
-            amountUSD
-            logIndex
+            ...SwapFields
         }
     }
     """,
 
     "swaps_all": """
-    query GetSwapsAll($first: Int!, $skip: Int!, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt) {
+    query GetSwapsAll($first: Int!, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt, $seenIds: [String!]) {
         swaps(
             first: $first
-            skip: $skip
             where: {
                 amountUSD_gte: $minAmountUSD
                 timestamp_gte: $startTime
                 timestamp_lte: $endTime
+                id_not_in: $seenIds
             }
             orderBy: timestamp
             orderDirection: desc
@@ -571,6 +543,248 @@ QUERIES_V2 = {
 }
 
 
+# -----------------------------------------------------------------------------
+# SHARED FRAGMENTS
+# Field selections shared by the single-pool "swaps" queries and their batched
+# (aliased) multi-pool form, see build_batched_swaps_query
+# -----------------------------------------------------------------------------
+SWAP_FRAGMENT_V3 = """
+    fragment SwapFields on Swap {
+        id
+        transaction {
+            id
+            blockNumber
+            timestamp
+            gasUsed
+            gasPrice
+        }
+        timestamp
+        pool {
+            id
+            token0 {
+                symbol
+            }
+            token1 {
+                symbol
+            }
+        }
+        sender
+        recipient
+        origin
+        amount0
+        amount1
+        amountUSD
+        sqrtPriceX96
+        tick
+        logIndex
+    }
+    """
+
+SWAP_FRAGMENT_V2 = """
+    fragment SwapFields on Swap {
+        id
+        transaction {
+            id
+            blockNumber
+            timestamp
+        }
+        timestamp
+        pair {
+            id
+            token0 {
+                symbol
+            }
+            token1 {
+                symbol
+            }
+        }
+        sender
+        to
+        amount0In
+        amount1In
+        amount0Out
+        amount1Out
+        amountUSD
+        logIndex
+    }
+    """
+
+QUERIES_V3["swaps"] += SWAP_FRAGMENT_V3
+QUERIES_V2["swaps"] += SWAP_FRAGMENT_V2
+
+# -----------------------------------------------------------------------------
+# LEAN SWAP QUERIES
+# Only the fields format_swap_v3/format_swap_v2 read. Token symbols are the
+# same on every swap of a pool, so instead of nesting them in each row they
+# are fetched once per pool with "pool_tokens" and joined client-side.
+# -----------------------------------------------------------------------------
+SWAP_FRAGMENT_V3_LEAN = """
+    fragment SwapFields on Swap {
+        id
+        transaction {
+            id
+            blockNumber
+        }
+        timestamp
+        pool {
+            id
+        }
+        sender
+        recipient
+        amount0
+        amount1
+        amountUSD
+    }
+    """
+
+SWAP_FRAGMENT_V2_LEAN = """
+    fragment SwapFields on Swap {
+        id
+        transaction {
+            id
+            blockNumber
+        }
+        timestamp
+        pair {
+            id
+        }
+        sender
+        to
+        amount0In
+        amount1In
+        amount0Out
+        amount1Out
+        amountUSD
+    }
+    """
+
+_SWAPS_ALL_LEAN = """
+    query GetSwapsAll($first: Int!, $minAmountUSD: String!, $startTime: BigInt, $endTime: BigInt, $seenIds: [String!]) {
+        swaps(
+            first: $first
+            where: {
+                amountUSD_gte: $minAmountUSD
+                timestamp_gte: $startTime
+                timestamp_lte: $endTime
+                id_not_in: $seenIds
+            }
+            orderBy: timestamp
+            orderDirection: desc
+        ) {
+            ...SwapFields
+        }
+    }
+    """
+
+QUERIES_V3["swaps_lean"] = QUERIES_V3["swaps"].replace(SWAP_FRAGMENT_V3, SWAP_FRAGMENT_V3_LEAN)
+QUERIES_V3["swaps_all_lean"] = _SWAPS_ALL_LEAN + SWAP_FRAGMENT_V3_LEAN
+QUERIES_V2["swaps_lean"] = QUERIES_V2["swaps"].replace(SWAP_FRAGMENT_V2, SWAP_FRAGMENT_V2_LEAN)
+QUERIES_V2["swaps_all_lean"] = _SWAPS_ALL_LEAN + SWAP_FRAGMENT_V2_LEAN
+
+QUERIES_V3["pool_tokens"] = """
+    query GetPoolTokens($ids: [ID!]!) {
+        pools(first: 1000, where: { id_in: $ids }) {
+            id
+            token0 {
+                id
+                symbol
+            }
+            token1 {
+                id
+                symbol
+            }
+        }
+    }
+    """
+
+QUERIES_V2["pool_tokens"] = """
+    query GetPairTokens($ids: [ID!]!) {
+        pairs(first: 1000, where: { id_in: $ids }) {
+            id
+            token0 {
+                id
+                symbol
+            }
+            token1 {
+                id
+                symbol
+            }
+        }
+    }
+    """
+
+# -----------------------------------------------------------------------------
+# ID CURSOR VARIANTS
+# Offset (skip) pagination costs O(skip) on the indexer for every page and
+# fails past skip=5000. Listings ordered by id page with id_gt instead:
+# $lastId is the last id returned so far ("" for the first page).
+# -----------------------------------------------------------------------------
+def _id_cursor_variant(query: str) -> str:
+    """Rewrite a skip/orderBy listing query to page by id_gt: $lastId."""
+    return query.replace(
+        "$skip: Int!, $orderBy: String!, $orderDirection: String!",
+        "$lastId: String!",
+    ).replace(
+        "skip: $skip\n            orderBy: $orderBy\n            orderDirection: $orderDirection",
+        "where: { id_gt: $lastId }\n            orderBy: id\n            orderDirection: asc",
+    )
+
+
+for _queries in (QUERIES_V3, QUERIES_V2):
+    _queries["pools_by_id"] = _id_cursor_variant(_queries["pools"])
+    _queries["tokens_by_id"] = _id_cursor_variant(_queries["tokens"])
+
+# Queries paginated with an id_gt cursor (see _id_cursor_variant)
+ID_CURSOR_QUERIES = {"pools_by_id", "tokens_by_id"}
+
+# Largest skip the subgraph gateway accepts
+MAX_SKIP = 5000
+
+# Queries that select only fields fixed when the entity is created (token
+# ids and symbols), so their responses never go stale
+IMMUTABLE_QUERIES = {"pool_tokens"}
+
+# Pools per batched swaps request
+SWAP_BATCH_SIZE = 10
+
+# Queries paginated with a timestamp keyset cursor instead of skip: $endTime
+# is the oldest timestamp seen so far and $seenIds the ids already returned at
+# it. Each page costs O(page_size) on the indexer regardless of depth, and
+# there is no 5000-row skip ceiling.
+TIMESTAMP_CURSOR_QUERIES = {"swaps", "swaps_all", "swaps_lean", "swaps_all_lean"}
+
+# Whitespace and the punctuation it can be dropped around (see minify_query)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION_SPACE = re.compile(r" ?([{}()\[\]:,!=@$]) ?")
+
+
+@functools.lru_cache(maxsize=None)
+def minify_query(query: str) -> str:
+    """
+    Strip insignificant whitespace from a GraphQL query.
+
+    The query text is sent with every page, so indentation alone can be
+    half the request body. Queries with string literals or comments, where
+    whitespace can matter, are returned unchanged.
+
+    Args:
+        query: GraphQL query string
+
+    Returns:
+        Equivalent query on one line, e.g. "query GetPools($first:Int!){...}"
+    """
+    if '"' in query or "#" in query:
+        return query
+    return _PUNCTUATION_SPACE.sub(r"\1", _WHITESPACE.sub(" ", query)).strip()
+
+
+# Queries are re-sent with every page; store them minified. Done last, as
+# the variants above are derived by matching the formatted text.
+for _queries in (QUERIES_V3, QUERIES_V2):
+    for _name, _query in _queries.items():
+        _queries[_name] = minify_query(_query)
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -590,10 +804,69 @@ def get_queries_for_dex_type(dex_type: str) -> dict[str, str]:
     return QUERIES_V3
 
 
+@functools.lru_cache(maxsize=None)
+def resolve_url(url: str, api_key: str) -> str:
+    """
+    Fill the {api_key} placeholder of a subgraph URL.
+
+    The key is fixed for the life of the process, so each endpoint is
+    resolved once and shared by every client created for it.
+    """
+    return url.replace("{api_key}", api_key)
+
+
 def is_v2_dex(dex_type: str) -> bool:
     """Check if the DEX type uses V2 schema (pairs instead of pools)."""
     return dex_type.endswith("_v2")
 
 
+def build_batched_swaps_query(dex_type: str, pages: list[dict], profile: str = "full") -> tuple[str, dict]:
+    """
+    Build one GraphQL document that fetches a swaps page for several pools.
+
+    Each pool becomes an aliased root field (p0, p1, ...) selecting the
+    shared SwapFields fragment, so N pools cost a single HTTP round-trip.
+    Every pool pages with its own timestamp cursor ($end{i}, $seen{i}; see
+    TIMESTAMP_CURSOR_QUERIES). The amount and start-time filters are shared
+    and passed as $minAmountUSD and $startTime by the caller.
+
+    Args:
+        dex_type: The DEX type (e.g., "uniswap_v3", "pancakeswap_v2")
+        pages: Per-pool page variables, each with "pool_id", "first",
+            "end_time" (cursor) and "seen_ids"
+        profile: "full" or "lean" field selection (see SWAP_FRAGMENT_V3_LEAN)
+
+    Returns:
+        Tuple of (query string, per-pool variables)
+    """
+    lean = profile == "lean"
+    if is_v2_dex(dex_type):
+        pool_filter, fragment = "pair_", SWAP_FRAGMENT_V2_LEAN if lean else SWAP_FRAGMENT_V2
+    else:
+        pool_filter, fragment = "pool_", SWAP_FRAGMENT_V3_LEAN if lean else SWAP_FRAGMENT_V3
+
+    params = "".join(
+        f", $first{i}: Int!, $pool{i}: String!, $end{i}: BigInt, $seen{i}: [String!]" for i in range(len(pages))
+    )
+    fields = "\n".join(
+        f"        p{i}: swaps(first: $first{i}, where: {{ {pool_filter}: {{ id: $pool{i} }}, "
+        f"amountUSD_gte: $minAmountUSD, timestamp_gte: $startTime, timestamp_lte: $end{i}, id_not_in: $seen{i} }}, "
+        f"orderBy: timestamp, orderDirection: desc) {{ ...SwapFields }}"
+        for i in range(len(pages))
+    )
+    variables = {}
+    for i, page in enumerate(pages):
+        variables[f"first{i}"] = page["first"]
+        variables[f"pool{i}"] = page["pool_id"]
+        variables[f"end{i}"] = page["end_time"]
+        variables[f"seen{i}"] = page["seen_ids"]
+
+    query = (
+        f"query BatchedSwaps($minAmountUSD: String!, $startTime: BigInt{params}) {{\n"
+        f"{fields}\n    }}\n{fragment}"
+    )
+    return query, variables
+
+
 # Legacy alias for backwards compatibility
 QUERIES = QUERIES_V3
@@ -41,24 +41,104 @@ Usage
 Requirements
 ------------
     pip install requests
+    pip install brotli      # optional, accepts brotli-compressed responses
+    pip install backports.zstd  # optional (Python < 3.14), accepts zstd-compressed responses
+    pip install orjson      # optional, faster JSON parsing/serialization
+    pip install pyarrow     # optional, enables Parquet output (--format parquet)
+    pip install diskcache   # optional, persists the response cache (--cache) across runs
+    pip install zstandard   # optional, compresses cached responses and --compress output
 
 Author: Generated with Claude Code
 """
 
 import argparse
+import copy
+import functools
+import gzip
+import hashlib
+import itertools
 import json
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# orjson parses ~2-4x and serializes ~5-10x faster than the stdlib json
+# module. Optional.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize to JSON bytes (stdlib fallback for >64-bit ints)."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None, default=str)
+        except orjson.JSONEncodeError:
+            return _stdlib_dumps(obj, indent)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize to JSON bytes."""
+        return _stdlib_dumps(obj, indent)
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    """Serialize to JSON bytes with the stdlib json module, indented or compact."""
+    if indent:
+        return json.dumps(obj, indent=2, default=str).encode()
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+# pyarrow enables the columnar bulk swap formatter and Parquet output
+# (--format parquet). Optional.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# diskcache backs the on-disk response cache (--cache). Optional; without it
+# responses are only cached in memory for the life of the process.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# zstandard compresses cached responses (~5x smaller) and JSON/JSONL output
+# (--compress). Optional; gzip output needs only the standard library.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from queries import (
+    QUERIES_V2,
+    QUERIES_V3,
     SubgraphConfig,
+    ID_CURSOR_QUERIES,
+    IMMUTABLE_QUERIES,
+    MAX_SKIP,
     SUBGRAPH_CONFIGS,
-    get_queries_for_dex_type,
+    SWAP_BATCH_SIZE,
+    TIMESTAMP_CURSOR_QUERIES,
+    build_batched_swaps_query,
     is_v2_dex,
+    minify_query,
+    resolve_url,
 )
 
 
@@ -66,6 +146,371 @@ from queries import (
 # GRAPH CLIENT
 # =============================================================================
 
+# (connect, read) timeout in seconds for subgraph requests
+REQUEST_TIMEOUT = (5, 30)
+
+# Retry transient gateway failures (rate limiting, 5xx) with jittered
+# exponential backoff, waiting out Retry-After when the gateway sends one.
+# GraphQL queries are reads, so retrying the POST is safe. Once the retries
+# are spent the error propagates and the crawl stops.
+REQUEST_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    backoff_max=30,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+)
+
+
+# GraphQL error with which Apollo-style servers refuse hash-only requests
+# outright, as opposed to PersistedQueryNotFound for an unknown hash
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+# Offset-paginated pages requested together when the item limit is known
+# in advance: one batched request, or parallel ones (see TheGraphClient.iter_pages)
+SPECULATIVE_PAGES = 4
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "thegraph_dex")
+
+# Responses whose time window ends this long ago (seconds) are treated as
+# immutable on-chain history and cached without expiry; anything else
+# (recent windows, pool/token statistics) expires after MUTABLE_CACHE_TTL.
+IMMUTABLE_AFTER = 3600
+MUTABLE_CACHE_TTL = 60
+
+# Variables holding a query's upper time bound: endTime, or end0, end1, ...
+# in batched multi-pool queries
+_END_TIME_VARIABLE_RE = re.compile(r"endTime|end\d+")
+
+# Query texts whose responses are cached without expiry (see IMMUTABLE_QUERIES)
+_IMMUTABLE_QUERY_TEXTS = frozenset(
+    queries[name] for queries in (QUERIES_V3, QUERIES_V2) for name in IMMUTABLE_QUERIES
+)
+
+# How a ResponseCache is used: "read-write" serves hits and stores misses;
+# "refresh" ignores existing entries but stores fresh responses; "read-only"
+# serves hits without storing anything new
+CACHE_MODES = ["read-write", "refresh", "read-only"]
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of GraphQL responses, in memory and on disk.
+
+    Entries are keyed by the request hash computed in TheGraphClient.query
+    and stored as (optionally zstd-compressed) JSON bytes, so every hit
+    decodes a fresh copy that callers may modify. Both layers evict least
+    recently used entries past their size limit; the on-disk layer uses
+    diskcache when it is installed. Safe to share between clients on
+    different threads.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        size_limit: int = 2 ** 30,
+        mode: str = "read-write",
+        memory_size_limit: int = 2 ** 27,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the on-disk cache
+            size_limit: Maximum on-disk size in bytes before LRU eviction
+            mode: One of CACHE_MODES
+            memory_size_limit: Maximum in-memory size in bytes (of stored
+                blobs) before LRU eviction
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {', '.join(CACHE_MODES)}")
+        self.mode = mode
+        # Least recently used first
+        self._memory: OrderedDict[str, tuple[Optional[float], bytes]] = OrderedDict()
+        self._memory_size = 0
+        self._memory_size_limit = memory_size_limit
+        self._lock = threading.Lock()
+        self._disk = None
+        if diskcache is not None:
+            self._disk = diskcache.Cache(directory, size_limit=size_limit, eviction_policy="least-recently-used")
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached response data for `key`, or None on a miss."""
+        if self.mode == "refresh":
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, blob = entry
+                if expires_at is None or expires_at > time.time():
+                    self._memory.move_to_end(key)
+                else:
+                    self._forget(key)
+                    entry = None
+        if entry is not None:
+            return _decode_cached(entry[1])
+
+        if self._disk is not None:
+            blob = self._disk.get(key)
+            if blob is not None:
+                return _decode_cached(blob)
+        return None
+
+    def set(self, key: str, data: dict[str, Any], query: str, variables: dict[str, Any]) -> None:
+        """Cache response data, with an expiry chosen from the query (see response_ttl)."""
+        if self.mode == "read-only":
+            return
+
+        ttl = response_ttl(query, variables)
+        blob = _encode_cached(data)
+        with self._lock:
+            self._forget(key)
+            self._memory[key] = (None if ttl is None else time.time() + ttl, blob)
+            self._memory_size += len(blob)
+            while self._memory_size > self._memory_size_limit and self._memory:
+                self._forget(next(iter(self._memory)))
+        if self._disk is not None:
+            self._disk.set(key, blob, expire=ttl)
+
+    def _forget(self, key: str) -> None:
+        """Drop an in-memory entry, if present. Call with the lock held."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_size -= len(entry[1])
+
+
+def response_ttl(query: str, variables: dict[str, Any]) -> Optional[int]:
+    """
+    Choose how long a response may be cached.
+
+    Args:
+        query: The request's GraphQL query
+        variables: The request's GraphQL variables
+
+    Returns:
+        None (no expiry) for IMMUTABLE_QUERIES, or if every upper time bound
+        is at least IMMUTABLE_AFTER seconds in the past; otherwise
+        MUTABLE_CACHE_TTL
+    """
+    if query in _IMMUTABLE_QUERY_TEXTS:
+        return None
+    end_times = [int(v) for k, v in variables.items() if _END_TIME_VARIABLE_RE.fullmatch(k) and v is not None]
+    if end_times and max(end_times) <= time.time() - IMMUTABLE_AFTER:
+        return None
+    return MUTABLE_CACHE_TTL
+
+
+def _encode_cached(data: dict[str, Any]) -> bytes:
+    raw = _dumps(data)
+    if zstandard is not None:
+        return b"Z" + zstandard.ZstdCompressor(level=3).compress(raw)
+    return b"J" + raw
+
+
+def _decode_cached(blob: bytes) -> Optional[dict[str, Any]]:
+    if blob[:1] == b"Z":
+        if zstandard is None:
+            # Written by a run that had zstandard; treat as a miss
+            return None
+        return _loads(zstandard.ZstdDecompressor().decompress(blob[1:]))
+    return _loads(blob[1:])
+
+
+@functools.lru_cache(maxsize=None)
+def query_hash(query: str) -> str:
+    """SHA-256 hex digest of a query as sent (minified), for Automatic Persisted Queries."""
+    return hashlib.sha256(minify_query(query).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def compile_query(query: str) -> Callable[..., bytes]:
+    """
+    Build a function that renders the request body for a query.
+
+    The query text is the bulk of every body and is the same on every page,
+    so it is minified (see minify_query) and JSON-encoded once here; the
+    returned function serializes only the variables (and extensions, if
+    given) per request.
+
+    Args:
+        query: GraphQL query string
+
+    Returns:
+        `build_body(variables, extensions=None) -> bytes`
+    """
+    prefix = b'{"query":' + json.dumps(minify_query(query)).encode() + b',"variables":'
+
+    def build_body(variables: dict[str, Any], extensions: Optional[dict[str, Any]] = None) -> bytes:
+        if extensions is None:
+            return prefix + _dumps(variables) + b"}"
+        return prefix + _dumps(variables) + b',"extensions":' + _dumps(extensions) + b"}"
+
+    return build_body
+
+
+def encode_payload(payload: dict[str, Any]) -> bytes:
+    """Serialize a GraphQL request payload to JSON bytes (see compile_query)."""
+    if "query" in payload:
+        return compile_query(payload["query"])(payload["variables"], payload.get("extensions"))
+    # Hash-only persisted query
+    return b'{"variables":' + _dumps(payload["variables"]) + b',"extensions":' + _dumps(payload["extensions"]) + b"}"
+
+
+def result_data(result: dict[str, Any]) -> dict[str, Any]:
+    """Return the data of a GraphQL result, raising ValueError on GraphQL errors."""
+    if "errors" in result:
+        error_messages = [e.get("message", str(e)) for e in result["errors"]]
+        raise ValueError(f"GraphQL errors: {'; '.join(error_messages)}")
+    return result.get("data", {})
+
+
+# Requests currently being sent, keyed by a hash of URL and body, so that
+# concurrent identical queries share one round-trip (see TheGraphClient.query)
+_IN_FLIGHT: dict[str, Future] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+# Token metadata by (subgraph URL, token id), and each pool's token ids by
+# (subgraph URL, pool id). Both are immutable on-chain, so they are shared by
+# every client in the process and never expire; the lean swap queries rely on
+# them instead of re-fetching nested token objects on every row.
+TOKEN_CACHE: dict[tuple[str, str], dict[str, Any]] = {}
+POOL_TOKEN_IDS: dict[tuple[str, str], tuple[str, str]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def remember_pool_tokens(url: str, pools: Iterable[dict[str, Any]]) -> None:
+    """
+    Record the token0/token1 metadata of raw pool (or pair) records.
+
+    Tokens are stored once per id, so a token shared by many pools is a
+    single dict; metadata seen later (e.g. name/decimals from the pools
+    query) is merged in.
+
+    Args:
+        url: Subgraph URL template (pool addresses can repeat across chains)
+        pools: Raw pool records with `id`, `token0` and `token1` (each with `id`)
+    """
+    with _TOKEN_CACHE_LOCK:
+        for pool in pools:
+            token_ids = []
+            for side in ("token0", "token1"):
+                token = pool.get(side) or {}
+                if "id" not in token:
+                    break
+                cached = TOKEN_CACHE.setdefault((url, token["id"]), dict(token))
+                cached.update(token)
+                token_ids.append(token["id"])
+            else:
+                POOL_TOKEN_IDS[(url, pool["id"])] = tuple(token_ids)
+
+
+def advance_timestamp_cursor(
+    items: list[dict[str, Any]],
+    cursor: str,
+    seen_ids: list[str],
+) -> tuple[str, list[str]]:
+    """
+    Compute the timestamp cursor for the page after `items`.
+
+    Pages are ordered by timestamp descending and request rows with
+    `timestamp <= cursor` and `id not in seen_ids`, so rows sharing a
+    timestamp across a page boundary are neither duplicated nor skipped.
+
+    Args:
+        items: The page just fetched (non-empty), newest first
+        cursor: The cursor the page was fetched with
+        seen_ids: The seen ids the page was fetched with
+
+    Returns:
+        Tuple of (next cursor, next seen ids)
+    """
+    last_timestamp = items[-1]["timestamp"]
+    tail_ids = [item["id"] for item in items if item["timestamp"] == last_timestamp]
+
+    # Still on the same timestamp (a burst larger than one page): keep
+    # excluding everything already returned at it
+    if last_timestamp == cursor:
+        return cursor, seen_ids + tail_ids
+    return last_timestamp, tail_ids
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how often requests are sent.
+
+    Up to `burst` requests may go out at once; the bucket refills at `rate`
+    requests per second. acquire() only blocks once the budget is spent, so
+    requests slower than the limit never wait, unlike a fixed sleep after
+    every response.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the limiter with a full bucket.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests sent back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token even if it isn't there yet, so concurrent
+            # callers queue up behind each other rather than all waking at once
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Rate limiters by gateway host. The gateway limits requests per host, not
+# per subgraph, so every client in the process (e.g., the --concurrency
+# download workers) draws from one budget per host.
+_RATE_LIMITERS: dict[str, RateLimiter] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def shared_rate_limiter(url: str, rate: float, burst: int = 1) -> RateLimiter:
+    """
+    Get the process-wide RateLimiter for a URL's host, creating it if needed.
+
+    The first caller for a host sets its rate and burst; later callers get
+    the same limiter whatever they pass.
+
+    Args:
+        url: Endpoint URL
+        rate: Sustained requests per second
+        burst: Maximum requests sent back to back
+
+    Returns:
+        The RateLimiter shared by every endpoint on the host
+    """
+    host = urlsplit(url).netloc
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(host)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[host] = RateLimiter(rate, burst)
+        return limiter
+
+
 class TheGraphClient:
     """
     A client for querying The Graph Protocol subgraphs.
@@ -78,25 +523,62 @@ class TheGraphClient:
 
     Attributes:
         config: SubgraphConfig containing the endpoint URL and metadata
-        rate_limit_delay: Seconds to wait between paginated requests
+        rate_limit_delay: Average seconds between requests per concurrent
+            request slot (see RateLimiter)
 
     Example:
         >>> client = TheGraphClient(SUBGRAPH_CONFIGS["uniswap_v3_ethereum"])
         >>> pools = client.query("pools", {"first": 10, "skip": 0})
     """
 
-    def __init__(self, config: SubgraphConfig, api_key: Optional[str] = None, rate_limit_delay: float = 0.5):
+    def __init__(
+        self,
+        config: SubgraphConfig,
+        api_key: Optional[str] = None,
+        rate_limit_delay: float = 0.5,
+        cache: Optional[ResponseCache] = None,
+        persisted_queries: bool = False,
+        page_concurrency: int = 4,
+    ):
         """
         Initialize the Graph client.
 
         Args:
             config: Subgraph configuration with endpoint URL
             api_key: The Graph API key (from https://thegraph.com/studio/)
-            rate_limit_delay: Delay between requests to respect rate limits
+            rate_limit_delay: Delay between requests to respect rate limits.
+                Up to page_concurrency requests may be sent per delay; time
+                spent waiting for a response counts toward it. The limit is
+                shared by every client of the same host (see
+                shared_rate_limiter).
+            cache: Optional response cache consulted before the network
+            persisted_queries: Use Automatic Persisted Queries: after a
+                query has been sent once, later requests carry only its
+                SHA-256 hash. Needs gateway support, so it is off by default.
+            page_concurrency: Maximum number of requests in flight when
+                several pages are fetched at once (see query_many)
         """
         self.config = config
         self.api_key = api_key or os.environ.get("GRAPH_API_KEY")
         self.rate_limit_delay = rate_limit_delay
+        self.cache = cache
+        self.persisted_queries = persisted_queries
+        self.page_concurrency = max(1, page_concurrency)
+
+        # Applied to every HTTP request, so cache hits are never throttled
+        self.limiter = None
+        if rate_limit_delay > 0:
+            self.limiter = shared_rate_limiter(
+                config.url, self.page_concurrency / rate_limit_delay, burst=self.page_concurrency
+            )
+
+        # Hashes of queries the server has accepted in full, and so can be
+        # sent hash-only from then on
+        self._persisted_hashes: set[str] = set()
+
+        # Whether the server accepts batched (JSON array) requests; cleared
+        # the first time it doesn't (see query_many)
+        self._batching = True
 
         if not self.api_key:
             raise ValueError(
@@ -104,15 +586,38 @@ class TheGraphClient:
                 "Get a free API key at https://thegraph.com/studio/"
             )
 
-        # Replace {api_key} placeholder in URL
-        self.url = config.url.format(api_key=self.api_key)
+        # Replace {api_key} placeholder in URL (resolved once per endpoint)
+        self.url = resolve_url(config.url, self.api_key)
 
+        # One keep-alive session for every request this client makes, so
+        # paginated queries reuse a single TLS connection instead of
+        # handshaking per page
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=REQUEST_RETRY)
+        self.session.mount("https://", adapter)
+        # Self-hosted graph-node endpoints are often plain http
+        self.session.mount("http://", adapter)
+
+        # Swap pages are highly repetitive JSON and compress ~10x. Advertise
+        # every encoding urllib3 can decode (gzip/deflate, plus br with brotli
+        # and zstd with backports.zstd, or on Python 3.14+; urllib3 doesn't
+        # use the zstandard package); bodies are decoded transparently.
+        self.session.headers.update(make_headers(accept_encoding=True))
         self.session.headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json",
         })
 
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "TheGraphClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
         """
         Execute a GraphQL query against the subgraph.
@@ -120,6 +625,12 @@ class TheGraphClient:
         This method sends a POST request to the subgraph endpoint with the
         GraphQL query and variables, then returns the parsed response.
 
+        With persisted queries enabled, a query the server has already seen
+        is sent as its hash alone; if the server has evicted it (or rejects
+        the hash for any other reason) the full query is sent again. A
+        server that can't take hash-only requests at all (an HTTP 4xx or
+        PersistedQueryNotSupported reply) gets full queries from then on.
+
         Args:
             query: GraphQL query string
             variables: Dictionary of variables to pass to the query
@@ -138,22 +649,151 @@ class TheGraphClient:
             ... )
             >>> pools = response["pools"]
         """
-        payload = {
-            "query": query,
-            "variables": variables,
-        }
+        body = compile_query(query)(variables)
+
+        # Coalesce identical requests that are already in flight (from any
+        # client, e.g. overlapping multi-subgraph or multi-pool workers):
+        # the first caller sends it and the rest wait for its result. All
+        # queries here are reads, so sharing a response is always safe.
+        key = hashlib.blake2b(self.url.encode() + b"\n" + body, digest_size=16).hexdigest()
+
+        if self.cache is not None:
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+        with _IN_FLIGHT_LOCK:
+            future = _IN_FLIGHT.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = _IN_FLIGHT[key] = Future()
+
+        if not is_owner:
+            # Callers may modify what they get back, so each decodes its own
+            # tree from the shared (immutable) response body
+            return result_data(_loads(future.result()))
+
+        try:
+            data, content = self._send(query, variables, body)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            # Waiters never see `data` itself, so this caller may modify it
+            future.set_result(content)
+            if self.cache is not None:
+                self.cache.set(key, data, query, variables)
+            return data
+        finally:
+            with _IN_FLIGHT_LOCK:
+                del _IN_FLIGHT[key]
+
+    def _payload(self, query: str, variables: dict[str, Any], hash_only: bool = False) -> dict[str, Any]:
+        """Build a request payload, with a persisted-query hash if enabled."""
+        payload: dict[str, Any] = {"variables": variables}
+        if not hash_only:
+            payload["query"] = query
+        if self.persisted_queries:
+            payload["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+        return payload
+
+    def _persisted_payload(self, query: str, variables: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Return a hash-only payload if the server already knows this query."""
+        if self.persisted_queries and query_hash(query) in self._persisted_hashes:
+            return self._payload(query, variables, hash_only=True)
+        return None
 
-        response = self.session.post(self.url, json=payload)
+    def _reject_persisted(self, query: str, error: Exception) -> None:
+        """Forget a hash the server rejected, and stop sending hashes if it can't take them."""
+        self._persisted_hashes.discard(query_hash(query))
+
+        if isinstance(error, requests.HTTPError):
+            unsupported = error.response is not None and 400 <= error.response.status_code < 500
+        else:
+            unsupported = PERSISTED_QUERY_NOT_SUPPORTED in str(error)
+        if unsupported and self.persisted_queries:
+            print(f"  {self.config.name} doesn't accept persisted queries; sending full queries")
+            self.persisted_queries = False
+
+    def _send(self, query: str, variables: dict[str, Any], body: bytes) -> tuple[dict[str, Any], bytes]:
+        """Send a query, hash-only when possible, and return its data and raw response body."""
+        if not self.persisted_queries:
+            return self._post(body)
+
+        payload = self._persisted_payload(query, variables)
+        if payload is not None:
+            try:
+                return self._post(encode_payload(payload))
+            except (ValueError, requests.HTTPError) as e:
+                self._reject_persisted(query, e)
+
+        result = self._post(encode_payload(self._payload(query, variables)))
+        self._persisted_hashes.add(query_hash(query))
+        return result
+
+    def _throttle(self) -> None:
+        """Wait, if needed, until the rate limit allows another request."""
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+    def _post(self, body: bytes) -> tuple[dict[str, Any], bytes]:
+        """Send one encoded GraphQL request and return its data and raw response body, raising on errors."""
+        self._throttle()
+        response = self.session.post(self.url, data=body, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        result = response.json()
+        # Parse the raw bytes directly, avoiding a decode-to-str round-trip
+        return result_data(_loads(response.content)), response.content
+
+    def query_many(self, operations: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """
+        Execute several GraphQL operations in one HTTP request.
+
+        The operations are POSTed together as a JSON array (Apollo-style
+        query batching) and answered in one round-trip. A server that
+        doesn't accept batches is detected on the first attempt; from then
+        on, and whenever a response cache or persisted queries are in use,
+        the operations are sent through query() as separate requests, up to
+        page_concurrency at a time.
+
+        Args:
+            operations: (query, variables) pairs
+
+        Returns:
+            Response data for each operation, in order
+
+        Raises:
+            requests.RequestException: If an HTTP request fails
+            ValueError: If any response contains GraphQL errors
+        """
+        if len(operations) <= 1 or not self._batching or self.cache is not None or self.persisted_queries:
+            return self._query_concurrently(operations)
+
+        body = b"[" + b",".join(compile_query(query)(variables) for query, variables in operations) + b"]"
+        self._throttle()
+        response = self.session.post(self.url, data=body, timeout=REQUEST_TIMEOUT)
 
-        # Check for GraphQL errors
-        if "errors" in result:
-            error_messages = [e.get("message", str(e)) for e in result["errors"]]
-            raise ValueError(f"GraphQL errors: {'; '.join(error_messages)}")
+        results = None
+        if response.ok:
+            try:
+                results = _loads(response.content)
+            except ValueError:
+                pass
+
+        if not isinstance(results, list) or len(results) != len(operations):
+            # The server rejected or misread the array; don't try again
+            self._batching = False
+            return self._query_concurrently(operations)
+
+        return [result_data(result) for result in results]
+
+    def _query_concurrently(self, operations: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Run operations as separate requests over the pooled session, in parallel."""
+        if len(operations) <= 1 or self.page_concurrency == 1:
+            return [self.query(query, variables) for query, variables in operations]
 
-        return result.get("data", {})
+        with ThreadPoolExecutor(max_workers=min(self.page_concurrency, len(operations))) as executor:
+            return list(executor.map(lambda operation: self.query(*operation), operations))
 
     def query_with_pagination(
         self,
@@ -168,11 +808,14 @@ class TheGraphClient:
 
         The Graph limits queries to 1000 items per request (often 100 for
         complex queries). This method handles pagination automatically,
-        making multiple requests and combining the results.
+        making multiple requests and combining the results. Queries in
+        TIMESTAMP_CURSOR_QUERIES page with a timestamp cursor (advancing
+        endTime/seenIds) rather than skip, so deep history stays cheap.
 
         Args:
             query_name: Key in QUERIES dict for the query template
-            variables: Base variables for the query (first/skip will be set)
+            variables: Base variables for the query (first/skip, or
+                endTime/seenIds for cursor queries, will be set)
             entity_name: Name of the entity list in the response (e.g., "pools")
             max_items: Maximum total items to retrieve (None for all available)
             page_size: Number of items per page (max 1000, often 100 is safer)
@@ -180,6 +823,11 @@ class TheGraphClient:
         Returns:
             List of all retrieved entities
 
+        Raises:
+            requests.RequestException: If a page still fails once the
+                transport's retries (REQUEST_RETRY) are spent
+            ValueError: If a page contains GraphQL errors
+
         Example:
             >>> all_swaps = client.query_with_pagination(
             ...     "swaps_all",
@@ -188,55 +836,223 @@ class TheGraphClient:
             ...     max_items=500
             ... )
         """
-        all_items = []
+        pages = self.iter_pages(query_name, variables, entity_name, max_items, page_size)
+        return list(itertools.chain.from_iterable(pages))
+
+    def iter_pages(
+        self,
+        query_name: str,
+        variables: dict[str, Any],
+        entity_name: str,
+        max_items: Optional[int] = None,
+        page_size: int = 100,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Iterate over the pages of a paginated query, one list per page.
+
+        Takes the same arguments as query_with_pagination, but only one page
+        is held at a time, so callers can process and write pages as they
+        arrive.
+
+        Yields:
+            Lists of entities, one per page
+        """
+        total = 0
         skip = 0
-        queries = get_queries_for_dex_type(self.config.dex_type)
+        queries = self.config.queries
         query = queries[query_name]
 
+        cursor_paginated = query_name in TIMESTAMP_CURSOR_QUERIES
+        cursor = variables.get("endTime")
+        seen_ids: list[str] = []
+
+        id_paginated = query_name in ID_CURSOR_QUERIES
+        last_id = ""
+
         while True:
             # Determine how many items to request this page
             if max_items is not None:
-                remaining = max_items - len(all_items)
+                remaining = max_items - total
                 if remaining <= 0:
                     break
-                current_page_size = min(page_size, remaining)
+                page_sizes = [min(page_size, remaining)]
             else:
-                current_page_size = page_size
-
-            # Update pagination variables
-            page_variables = {**variables, "first": current_page_size, "skip": skip}
-
-            print(f"  Fetching items {skip} to {skip + current_page_size}...")
-
-            try:
-                data = self.query(query, page_variables)
-                items = data.get(entity_name, [])
+                remaining = None
+                page_sizes = [page_size]
+
+            # Update pagination variables. Cursors depend on the previous
+            # page, but with a limit the offsets of upcoming pages are known,
+            # so several offset pages go out in one request (see query_many)
+            if cursor_paginated:
+                batch = [{**variables, "first": page_sizes[0], "endTime": cursor, "seenIds": seen_ids}]
+            elif id_paginated:
+                batch = [{**variables, "first": page_sizes[0], "lastId": last_id}]
+            else:
+                if remaining is not None:
+                    while len(page_sizes) < SPECULATIVE_PAGES and sum(page_sizes) < remaining:
+                        page_sizes.append(min(page_size, remaining - sum(page_sizes)))
+                offsets = itertools.accumulate(page_sizes[:-1], initial=skip)
+                batch = [
+                    {**variables, "first": size, "skip": offset}
+                    for size, offset in zip(page_sizes, offsets)
+                ]
+
+            print(f"  Fetching items {skip} to {skip + sum(page_sizes)}...")
+
+            if len(batch) == 1:
+                pages = [self.query(query, batch[0]).get(entity_name, [])]
+            else:
+                results = self.query_many([(query, page_variables) for page_variables in batch])
+                pages = [data.get(entity_name, []) for data in results]
 
+            finished = False
+            for current_page_size, items in zip(page_sizes, pages):
                 if not items:
                     # No more items available
+                    finished = True
                     break
 
-                all_items.extend(items)
+                total += len(items)
                 skip += len(items)
+                if cursor_paginated:
+                    cursor, seen_ids = advance_timestamp_cursor(items, cursor, seen_ids)
+                elif id_paginated:
+                    last_id = items[-1]["id"]
+
+                yield items
 
                 # If we got fewer items than requested, we've reached the end
                 if len(items) < current_page_size:
+                    finished = True
                     break
 
-                # Rate limiting
-                time.sleep(self.rate_limit_delay)
-
-            except Exception as e:
-                print(f"  Error during pagination: {e}")
+            if finished:
                 break
 
-        return all_items
+    def iter_pool_swap_pages(
+        self,
+        pool_ids: list[str],
+        variables: dict[str, Any],
+        max_items: Optional[int] = None,
+        page_size: int = 100,
+        profile: str = "full",
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Iterate over swap pages for several pools, batching up to SWAP_BATCH_SIZE pools per request.
+
+        Each request aliases one swaps page per pool (see
+        build_batched_swaps_query), so K pools cost ceil(K / SWAP_BATCH_SIZE)
+        round-trips per page instead of K. Pools drop out of the batch as
+        they are exhausted or reach max_items. Pages are yielded as each
+        request returns, so only one request's worth is held at a time.
+
+        Args:
+            pool_ids: Pool (or pair, for V2) addresses
+            variables: Shared filter variables (minAmountUSD, startTime), plus
+                "endTime", the initial cursor for every pool
+            max_items: Maximum swaps to retrieve per pool (None for all available)
+            page_size: Number of swaps per pool per request
+            profile: "full" or "lean" swap field selection
+
+        Yields:
+            (pool id, non-empty list of swaps) pairs
+        """
+        fetched = dict.fromkeys(pool_ids, 0)
+        cursors = {pool_id: (variables.get("endTime"), []) for pool_id in fetched}
+        shared_variables = {k: v for k, v in variables.items() if k != "endTime"}
+        active = list(fetched)
+
+        while active:
+            still_active = []
+
+            for start in range(0, len(active), SWAP_BATCH_SIZE):
+                pages = []
+                for pool_id in active[start:start + SWAP_BATCH_SIZE]:
+                    current_page_size = page_size if max_items is None else min(page_size, max_items - fetched[pool_id])
+                    end_time, seen_ids = cursors[pool_id]
+                    pages.append({
+                        "pool_id": pool_id,
+                        "first": current_page_size,
+                        "end_time": end_time,
+                        "seen_ids": seen_ids,
+                    })
+
+                query, page_variables = build_batched_swaps_query(self.config.dex_type, pages, profile=profile)
+
+                print(f"  Fetching swaps for {len(pages)} pools...")
+
+                data = self.query(query, {**shared_variables, **page_variables})
+
+                for i, page in enumerate(pages):
+                    pool_id = page["pool_id"]
+                    items = data.get(f"p{i}") or []
+                    fetched[pool_id] += len(items)
+                    if items:
+                        cursors[pool_id] = advance_timestamp_cursor(items, page["end_time"], page["seen_ids"])
+                        yield pool_id, items
+
+                    # A full page means the pool may have more
+                    if len(items) == page["first"] and (max_items is None or fetched[pool_id] < max_items):
+                        still_active.append(pool_id)
+
+            active = still_active
+
+    def get_pool_tokens(self, pool_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Look up the token0/token1 metadata of pools (or pairs, for V2).
+
+        Pools already in the process-wide token cache (see TOKEN_CACHE), from
+        earlier pages, other clients or a pools download, are not fetched again.
+
+        Args:
+            pool_ids: Pool addresses; duplicates are fetched once
+
+        Returns:
+            Dictionary mapping pool id to {"token0": {...}, "token1": {...}}
+        """
+        entity_name = "pairs" if self.config.is_v2 else "pools"
+        query = self.config.queries["pool_tokens"]
+
+        url = self.config.url
+
+        # A pool's tokens never change, so only look up pools not seen before
+        unique_ids = list(dict.fromkeys(pool_ids))
+        missing_ids = [pool_id for pool_id in unique_ids if (url, pool_id) not in POOL_TOKEN_IDS]
+
+        for start in range(0, len(missing_ids), 1000):
+            data = self.query(query, {"ids": missing_ids[start:start + 1000]})
+            remember_pool_tokens(url, data.get(entity_name, []))
+
+        tokens = {}
+        for pool_id in unique_ids:
+            token_ids = POOL_TOKEN_IDS.get((url, pool_id))
+            if token_ids is not None:
+                tokens[pool_id] = {
+                    "token0": TOKEN_CACHE[(url, token_ids[0])],
+                    "token1": TOKEN_CACHE[(url, token_ids[1])],
+                }
+        return tokens
 
 
 # =============================================================================
 # DATA PROCESSING
 # =============================================================================
 
+# Shared stand-in for a missing or null nested object; never modified
+_EMPTY: dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=4096)
+def local_isoformat(timestamp: int) -> str:
+    """
+    Format a Unix timestamp as a local-time ISO 8601 string.
+
+    Swaps in the same block share a timestamp, so formatted values are
+    memoized; building the datetime is the costliest step of format_swap.
+    """
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
 def format_swap_v3(swap: dict[str, Any]) -> dict[str, Any]:
     """
     Format a raw V3 swap record into a more readable structure.
@@ -251,16 +1067,17 @@ def format_swap_v3(swap: dict[str, Any]) -> dict[str, Any]:
         Formatted swap dictionary with additional computed fields
     """
     timestamp = int(swap.get("timestamp", 0))
-    pool = swap.get("pool", {})
+    pool = swap.get("pool") or _EMPTY
+    transaction = swap.get("transaction") or _EMPTY
 
     return {
         "id": swap.get("id"),
-        "tx_hash": swap.get("transaction", {}).get("id"),
-        "block_number": swap.get("transaction", {}).get("blockNumber"),
+        "tx_hash": transaction.get("id"),
+        "block_number": transaction.get("blockNumber"),
         "timestamp": timestamp,
-        "datetime": datetime.fromtimestamp(timestamp).isoformat() if timestamp else None,
+        "datetime": local_isoformat(timestamp) if timestamp else None,
         "pool_id": pool.get("id"),
-        "pair": f"{pool.get('token0', {}).get('symbol')}/{pool.get('token1', {}).get('symbol')}",
+        "pair": f"{(pool.get('token0') or _EMPTY).get('symbol')}/{(pool.get('token1') or _EMPTY).get('symbol')}",
         "amount0": float(swap.get("amount0", 0)),
         "amount1": float(swap.get("amount1", 0)),
         "amount_usd": float(swap.get("amountUSD", 0)),
@@ -283,7 +1100,8 @@ def format_swap_v2(swap: dict[str, Any]) -> dict[str, Any]:
         Formatted swap dictionary with additional computed fields
     """
     timestamp = int(swap.get("timestamp", 0))
-    pair = swap.get("pair", {})
+    pair = swap.get("pair") or _EMPTY
+    transaction = swap.get("transaction") or _EMPTY
 
     # V2 uses separate in/out fields - compute net amounts
     amount0_in = float(swap.get("amount0In", 0))
@@ -293,12 +1111,12 @@ def format_swap_v2(swap: dict[str, Any]) -> dict[str, Any]:
 
     return {
         "id": swap.get("id"),
-        "tx_hash": swap.get("transaction", {}).get("id"),
-        "block_number": swap.get("transaction", {}).get("blockNumber"),
+        "tx_hash": transaction.get("id"),
+        "block_number": transaction.get("blockNumber"),
         "timestamp": timestamp,
-        "datetime": datetime.fromtimestamp(timestamp).isoformat() if timestamp else None,
+        "datetime": local_isoformat(timestamp) if timestamp else None,
         "pool_id": pair.get("id"),
-        "pair": f"{pair.get('token0', {}).get('symbol')}/{pair.get('token1', {}).get('symbol')}",
+        "pair": f"{(pair.get('token0') or _EMPTY).get('symbol')}/{(pair.get('token1') or _EMPTY).get('symbol')}",
         "amount0_in": amount0_in,
         "amount0_out": amount0_out,
         "amount1_in": amount1_in,
@@ -315,6 +1133,9 @@ def format_swap(swap: dict[str, Any], dex_type: str) -> dict[str, Any]:
     """
     Format a raw swap record based on DEX type.
 
+    To format many swaps from one DEX, bind get_formatter("swap", dex_type)
+    once instead.
+
     Args:
         swap: Raw swap data from the subgraph
         dex_type: The DEX type to determine formatting
@@ -327,34 +1148,276 @@ def format_swap(swap: dict[str, Any], dex_type: str) -> dict[str, Any]:
     return format_swap_v3(swap)
 
 
-def format_pool_v3(pool: dict[str, Any]) -> dict[str, Any]:
+# Parquet rows buffered per bulk-format/write call
+PARQUET_CHUNK_ROWS = 10_000
+
+
+if pa is not None:
+    _RAW_POOL_TYPE = pa.struct([
+        ("id", pa.string()),
+        ("token0", pa.struct([("symbol", pa.string())])),
+        ("token1", pa.struct([("symbol", pa.string())])),
+    ])
+    _RAW_TRANSACTION_TYPE = pa.struct([("id", pa.string()), ("blockNumber", pa.string())])
+
+    # Shape of a raw swap as used by format_swap_v3 / format_swap_v2; the
+    # extra fields of the full profile are ignored
+    RAW_SWAP_SCHEMA_V3 = pa.schema([
+        ("id", pa.string()),
+        ("transaction", _RAW_TRANSACTION_TYPE),
+        ("timestamp", pa.string()),
+        ("pool", _RAW_POOL_TYPE),
+        ("sender", pa.string()),
+        ("recipient", pa.string()),
+        ("amount0", pa.string()),
+        ("amount1", pa.string()),
+        ("amountUSD", pa.string()),
+    ])
+    RAW_SWAP_SCHEMA_V2 = pa.schema([
+        ("id", pa.string()),
+        ("transaction", _RAW_TRANSACTION_TYPE),
+        ("timestamp", pa.string()),
+        ("pair", _RAW_POOL_TYPE),
+        ("sender", pa.string()),
+        ("to", pa.string()),
+        ("amount0In", pa.string()),
+        ("amount1In", pa.string()),
+        ("amount0Out", pa.string()),
+        ("amount1Out", pa.string()),
+        ("amountUSD", pa.string()),
+    ])
+
+    # Token amounts in Parquet output: exact, with 18 decimal places (the
+    # most any ERC-20 uses) and up to 20 integer digits
+    AMOUNT_TYPE = pa.decimal128(38, 18)
+
+
+def _cast_amounts(values: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """
+    Cast BigDecimal strings to AMOUNT_TYPE in one vectorized pass.
+
+    Digits past 18 decimal places are truncated (a plain cast rejects them);
+    amounts whose integer part doesn't fit, typically spam tokens, become null.
+    """
+    values = pc.replace_substring_regex(values, r"^(-?\d*\.\d{18})\d+$", r"\1")
+    too_large = pc.match_substring_regex(values, r"^-?\d{21,}")
+    values = pc.if_else(too_large, pa.scalar(None, pa.string()), values)
+    return pc.cast(values, AMOUNT_TYPE)
+
+
+def raw_swaps_table(swaps: list[dict[str, Any]], dex_type: str) -> "pa.Table":
+    """
+    Convert raw swap records to a columnar Arrow table of the raw fields.
+
+    from_pylist with a fixed schema walks the dicts in C++ without type
+    inference; this measured faster than appending to per-column Python
+    lists and building arrays from those.
+
+    Args:
+        swaps: Raw swap data from the subgraph
+        dex_type: The DEX type to determine the raw shape
+
+    Returns:
+        pyarrow Table with RAW_SWAP_SCHEMA_V3 or RAW_SWAP_SCHEMA_V2
+    """
+    return pa.Table.from_pylist(swaps, schema=RAW_SWAP_SCHEMA_V2 if is_v2_dex(dex_type) else RAW_SWAP_SCHEMA_V3)
+
+
+def format_swaps_bulk(swaps: Union[list[dict[str, Any]], "pa.Table"], dex_type: str) -> "pa.Table":
+    """
+    Format raw swap records into an Arrow table in bulk.
+
+    Produces the same columns as format_swap, but all conversions run as
+    Arrow compute kernels over whole columns instead of per-row Python.
+    Token amounts are parsed from their decimal strings straight into
+    decimal128(38, 18) (see _cast_amounts) rather than going through float;
+    `amount_usd` is an estimate anyway and stays float64. `datetime` is a
+    UTC timestamp column, and `pair` is dictionary-encoded, since a handful
+    of distinct pairs repeat across every row.
+
+    Args:
+        swaps: Raw swap data from the subgraph, as dicts or as a table from
+            raw_swaps_table
+        dex_type: The DEX type to determine the raw shape
+
+    Returns:
+        pyarrow Table with one row per swap
+    """
+    is_v2 = is_v2_dex(dex_type)
+    raw = swaps if isinstance(swaps, pa.Table) else raw_swaps_table(swaps, dex_type)
+    transaction = raw.column("transaction")
+    pool = raw.column("pair" if is_v2 else "pool")
+    timestamp = pc.cast(raw.column("timestamp"), pa.int64())
+
+    # Matches the f-string in format_swap, including "None" for a missing symbol
+    pair = pc.binary_join_element_wise(
+        pc.struct_field(pc.struct_field(pool, "token0"), "symbol"),
+        pc.struct_field(pc.struct_field(pool, "token1"), "symbol"),
+        "/",
+        null_handling="replace",
+        null_replacement="None",
+    )
+
+    columns = {
+        "id": raw.column("id"),
+        "tx_hash": pc.struct_field(transaction, "id"),
+        "block_number": pc.cast(pc.struct_field(transaction, "blockNumber"), pa.int64()),
+        "timestamp": timestamp,
+        "datetime": pc.cast(timestamp, pa.timestamp("s", tz="UTC")),
+        "pool_id": pc.struct_field(pool, "id"),
+        "pair": pc.dictionary_encode(pair),
+    }
+
+    amount_usd = pc.cast(raw.column("amountUSD"), pa.float64())
+
+    if is_v2:
+        amounts = {
+            name: _cast_amounts(raw.column(name))
+            for name in ("amount0In", "amount0Out", "amount1In", "amount1Out")
+        }
+
+        # In and out are both non-negative, so their difference always fits
+        # back into AMOUNT_TYPE; subtract at 256 bits so the result's widened
+        # precision is representable
+        def net(amount_in: "pa.ChunkedArray", amount_out: "pa.ChunkedArray") -> "pa.ChunkedArray":
+            wide = pa.decimal256(38, 18)
+            return pc.cast(pc.subtract(pc.cast(amount_in, wide), pc.cast(amount_out, wide)), AMOUNT_TYPE)
+
+        columns.update({
+            "amount0_in": amounts["amount0In"],
+            "amount0_out": amounts["amount0Out"],
+            "amount1_in": amounts["amount1In"],
+            "amount1_out": amounts["amount1Out"],
+            "amount0": net(amounts["amount0In"], amounts["amount0Out"]),
+            "amount1": net(amounts["amount1In"], amounts["amount1Out"]),
+            "amount_usd": amount_usd,
+            "sender": raw.column("sender"),
+            "recipient": raw.column("to"),
+        })
+    else:
+        columns.update({
+            "amount0": _cast_amounts(raw.column("amount0")),
+            "amount1": _cast_amounts(raw.column("amount1")),
+            "amount_usd": amount_usd,
+            "sender": raw.column("sender"),
+            "recipient": raw.column("recipient"),
+        })
+
+    return pa.table(columns)
+
+
+def iter_swap_tables(
+    pages: Iterable[list[dict[str, Any]]],
+    dex_type: str,
+    chunk_rows: int = PARQUET_CHUNK_ROWS,
+) -> Iterator["pa.Table"]:
+    """
+    Format pages of raw swaps into Arrow tables of about `chunk_rows` rows.
+
+    Each page is converted to columns on arrival (see raw_swaps_table), so
+    the raw dicts are released page by page and at most one chunk is
+    buffered, in columnar form. At least one (possibly empty) table is
+    always yielded.
+
+    Args:
+        pages: Lists of raw swaps (see iter_raw_swap_pages)
+        dex_type: The DEX type to determine the raw shape
+        chunk_rows: Rows per table; a table can overshoot by up to a page
+
+    Yields:
+        pyarrow Tables (see format_swaps_bulk)
+    """
+    buffer: list["pa.Table"] = []
+    rows = 0
+    emitted = False
+    for page in pages:
+        buffer.append(raw_swaps_table(page, dex_type))
+        rows += len(page)
+        if rows >= chunk_rows:
+            yield format_swaps_bulk(pa.concat_tables(buffer), dex_type)
+            buffer.clear()
+            rows = 0
+            emitted = True
+    if rows or not emitted:
+        yield format_swaps_bulk(pa.concat_tables(buffer) if buffer else raw_swaps_table([], dex_type), dex_type)
+
+
+def join_pool_tokens(client: "TheGraphClient", swaps: list[dict[str, Any]]) -> None:
+    """
+    Fill in pool token symbols on swaps fetched with the lean profile.
+
+    Lean swap queries select only the pool id; the symbols are looked up
+    once per distinct pool and attached in place, so format_swap sees the
+    same shape as a full query.
+
+    Args:
+        client: TheGraphClient instance
+        swaps: Raw swap records, modified in place
+    """
+    pool_key = "pair" if client.config.is_v2 else "pool"
+    pool_ids = [s[pool_key]["id"] for s in swaps if s.get(pool_key)]
+    if not pool_ids:
+        return
+
+    try:
+        tokens = client.get_pool_tokens(pool_ids)
+    except Exception as e:
+        print(f"  Error fetching pool tokens: {e}")
+        return
+
+    for swap in swaps:
+        pool = swap.get(pool_key)
+        if pool and pool["id"] in tokens:
+            pool.update(tokens[pool["id"]])
+
+
+def format_pool_token(token: dict[str, Any], interned: Optional[dict[str, dict[str, Any]]] = None) -> dict[str, Any]:
+    """
+    Format a pool's token0/token1 record.
+
+    Args:
+        token: Raw token data nested in a pool/pair
+        interned: Optional dict of tokens already formatted, by id. A token
+            found there is returned as is, so every pool sharing it (WETH,
+            USDC, ...) references one dict; treat the result as read-only.
+
+    Returns:
+        Dictionary with address, symbol, name and decimals
+    """
+    token_id = token.get("id")
+    if interned is not None and token_id in interned:
+        return interned[token_id]
+
+    formatted = {
+        "address": token_id,
+        "symbol": token.get("symbol"),
+        "name": token.get("name"),
+        "decimals": token.get("decimals"),
+    }
+    if interned is not None and token_id is not None:
+        interned[token_id] = formatted
+    return formatted
+
+
+def format_pool_v3(pool: dict[str, Any], interned: Optional[dict[str, dict[str, Any]]] = None) -> dict[str, Any]:
     """
     Format a raw V3 pool record into a more readable structure.
 
     Args:
         pool: Raw pool data from a V3 subgraph
+        interned: Optional shared token records (see format_pool_token)
 
     Returns:
         Formatted pool dictionary
     """
-    token0 = pool.get("token0", {})
-    token1 = pool.get("token1", {})
+    token0 = pool.get("token0") or _EMPTY
+    token1 = pool.get("token1") or _EMPTY
 
     return {
         "id": pool.get("id"),
         "pair": f"{token0.get('symbol')}/{token1.get('symbol')}",
-        "token0": {
-            "address": token0.get("id"),
-            "symbol": token0.get("symbol"),
-            "name": token0.get("name"),
-            "decimals": token0.get("decimals"),
-        },
-        "token1": {
-            "address": token1.get("id"),
-            "symbol": token1.get("symbol"),
-            "name": token1.get("name"),
-            "decimals": token1.get("decimals"),
-        },
+        "token0": format_pool_token(token0, interned),
+        "token1": format_pool_token(token1, interned),
         "fee_tier": int(pool.get("feeTier", 0)) / 10000,  # Convert to percentage
         "token0_price": float(pool.get("token0Price", 0)),
         "token1_price": float(pool.get("token1Price", 0)),
@@ -364,7 +1427,7 @@ def format_pool_v3(pool: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def format_pool_v2(pair: dict[str, Any]) -> dict[str, Any]:
+def format_pool_v2(pair: dict[str, Any], interned: Optional[dict[str, dict[str, Any]]] = None) -> dict[str, Any]:
     """
     Format a raw V2 pair record into a more readable structure.
 
@@ -372,28 +1435,19 @@ def format_pool_v2(pair: dict[str, Any]) -> dict[str, Any]:
 
     Args:
         pair: Raw pair data from a V2 subgraph
+        interned: Optional shared token records (see format_pool_token)
 
     Returns:
         Formatted pair dictionary (using "pool" naming for consistency)
     """
-    token0 = pair.get("token0", {})
-    token1 = pair.get("token1", {})
+    token0 = pair.get("token0") or _EMPTY
+    token1 = pair.get("token1") or _EMPTY
 
     return {
         "id": pair.get("id"),
         "pair": f"{token0.get('symbol')}/{token1.get('symbol')}",
-        "token0": {
-            "address": token0.get("id"),
-            "symbol": token0.get("symbol"),
-            "name": token0.get("name"),
-            "decimals": token0.get("decimals"),
-        },
-        "token1": {
-            "address": token1.get("id"),
-            "symbol": token1.get("symbol"),
-            "name": token1.get("name"),
-            "decimals": token1.get("decimals"),
-        },
+        "token0": format_pool_token(token0, interned),
+        "token1": format_pool_token(token1, interned),
         "fee_tier": 0.003,  # V2 uses fixed 0.3% fee
         "reserve0": float(pair.get("reserve0", 0)),
         "reserve1": float(pair.get("reserve1", 0)),
@@ -405,31 +1459,138 @@ def format_pool_v2(pair: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def format_pool(pool: dict[str, Any], dex_type: str) -> dict[str, Any]:
+def format_pool(
+    pool: dict[str, Any],
+    dex_type: str,
+    interned: Optional[dict[str, dict[str, Any]]] = None,
+) -> dict[str, Any]:
     """
     Format a raw pool/pair record based on DEX type.
 
     Args:
         pool: Raw pool/pair data from the subgraph
         dex_type: The DEX type to determine formatting
+        interned: Optional shared token records (see format_pool_token)
 
     Returns:
         Formatted pool dictionary
     """
     if is_v2_dex(dex_type):
-        return format_pool_v2(pool)
-    return format_pool_v3(pool)
+        return format_pool_v2(pool, interned)
+    return format_pool_v3(pool, interned)
 
 
-# =============================================================================
-# MAIN EXECUTION
-# =============================================================================
+# Row formatters by (entity, DEX version)
+_FORMATTERS: dict[tuple[str, str], Callable[..., dict[str, Any]]] = {
+    ("swap", "v2"): format_swap_v2,
+    ("swap", "v3"): format_swap_v3,
+    ("pool", "v2"): format_pool_v2,
+    ("pool", "v3"): format_pool_v3,
+}
 
-def download_pools(
-    client: TheGraphClient,
-    limit: int = 100,
-    order_by: str = "volumeUSD",
-    order_direction: str = "desc",
+
+def get_formatter(entity: str, dex_type: str) -> Callable[..., dict[str, Any]]:
+    """
+    Return the row formatter for an entity on a DEX type.
+
+    A crawl has a single DEX type, so callers resolve the formatter once
+    and apply it to every row, rather than dispatching per row through
+    format_swap / format_pool.
+
+    Args:
+        entity: "swap" or "pool"
+        dex_type: The DEX type to determine formatting
+
+    Returns:
+        format_swap_v2/v3 or format_pool_v2/v3
+
+    Example:
+        >>> formatter = get_formatter("swap", client.config.dex_type)
+        >>> rows = [formatter(swap) for swap in swaps]
+    """
+    return _FORMATTERS[entity, "v2" if is_v2_dex(dex_type) else "v3"]
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def sort_entities(entities: list[dict[str, Any]], order_by: str, order_direction: str) -> list[dict[str, Any]]:
+    """
+    Sort raw entities client-side, as the subgraph's orderBy would.
+
+    BigDecimal/BigInt fields arrive as strings, so values are compared as
+    numbers when they all parse as one, else as strings.
+
+    Args:
+        entities: Raw entities from the subgraph
+        order_by: Field to sort by
+        order_direction: "asc" or "desc"
+
+    Returns:
+        A new, sorted list
+    """
+    values = [entity.get(order_by) for entity in entities]
+    try:
+        keys = [float(value) for value in values]
+    except (TypeError, ValueError):
+        keys = ["" if value is None else str(value) for value in values]
+    order = sorted(range(len(entities)), key=keys.__getitem__, reverse=order_direction == "desc")
+    return [entities[i] for i in order]
+
+
+def iter_listing_pages(
+    client: TheGraphClient,
+    query_name: str,
+    entity_name: str,
+    limit: int,
+    order_by: str,
+    order_direction: str,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Iterate over the first `limit` pools or tokens in the requested order, page by page.
+
+    Listings ordered by ascending id page with an id_gt cursor. Other orders
+    page with skip, which the gateway refuses past MAX_SKIP; a longer
+    listing is crawled in full by id instead, then sorted client-side (see
+    sort_entities), truncated and yielded as a single page.
+
+    Args:
+        client: TheGraphClient instance
+        query_name: "pools" or "tokens" (the "_by_id" variant is derived)
+        entity_name: Name of the entity list in the response
+        limit: Maximum number of entities to retrieve
+        order_by: Field to sort by
+        order_direction: Sort direction (asc or desc)
+
+    Yields:
+        Lists of raw entities
+    """
+    variables = {
+        "orderBy": order_by,
+        "orderDirection": order_direction,
+    }
+
+    if (order_by, order_direction) == ("id", "asc"):
+        yield from client.iter_pages(f"{query_name}_by_id", variables, entity_name=entity_name, max_items=limit)
+    elif limit > MAX_SKIP:
+        print(
+            f"  {limit} exceeds the {MAX_SKIP}-row skip limit; "
+            f"fetching every {entity_name[:-1]} by id to sort locally"
+        )
+        entities = client.query_with_pagination(
+            f"{query_name}_by_id", variables, entity_name=entity_name, page_size=1000
+        )
+        yield sort_entities(entities, order_by, order_direction)[:limit]
+    else:
+        yield from client.iter_pages(query_name, variables, entity_name=entity_name, max_items=limit)
+
+
+def download_pools(
+    client: TheGraphClient,
+    limit: int = 100,
+    order_by: str = "volumeUSD",
+    order_direction: str = "desc",
 ) -> list[dict[str, Any]]:
     """
     Download liquidity pool data from the DEX.
@@ -439,75 +1600,106 @@ def download_pools(
     Args:
         client: TheGraphClient instance
         limit: Maximum number of pools to retrieve
-        order_by: Field to sort by (volumeUSD, reserveUSD for V2, txCount)
+        order_by: Field to sort by (volumeUSD, reserveUSD for V2, txCount,
+            or id; see iter_listing_pages for limits past MAX_SKIP rows)
         order_direction: Sort direction (asc or desc)
 
     Returns:
         List of formatted pool dictionaries
     """
     dex_type = client.config.dex_type
-    entity_name = "pairs" if is_v2_dex(dex_type) else "pools"
+    entity_name = "pairs" if client.config.is_v2 else "pools"
 
     print(f"\nDownloading top {limit} {entity_name} by {order_by}...")
 
-    variables = {
-        "orderBy": order_by,
-        "orderDirection": order_direction,
-    }
+    # A listing repeats the same few tokens across many pools; format each
+    # once and share the dict
+    interned: dict[str, dict[str, Any]] = {}
+    formatter = functools.partial(get_formatter("pool", dex_type), interned=interned)
 
-    pools = client.query_with_pagination(
-        "pools",  # Query key is always "pools", but actual GraphQL entity differs
-        variables,
-        entity_name=entity_name,
-        max_items=limit,
-    )
-
-    return [format_pool(p, dex_type) for p in pools]
+    # Pages are formatted as they arrive, so the raw pools are released page
+    # by page rather than held alongside the formatted list
+    pools: list[dict[str, Any]] = []
+    # Query key is always "pools", but actual GraphQL entity differs
+    for page in iter_listing_pages(client, "pools", entity_name, limit, order_by, order_direction):
+        # Warm the token cache so later swap downloads can skip these pools
+        remember_pool_tokens(client.config.url, page)
+        pools.extend(map(formatter, page))
+    return pools
 
 
-def download_swaps(
+def iter_raw_swap_pages(
     client: TheGraphClient,
     limit: int = 100,
-    pool_id: Optional[str] = None,
+    pool_id: Optional[Union[str, list[str]]] = None,
     min_amount_usd: float = 0,
     start_time: Optional[int] = None,
     end_time: Optional[int] = None,
-) -> list[dict[str, Any]]:
+    profile: str = "lean",
+) -> Iterator[list[dict[str, Any]]]:
     """
-    Download swap transaction data from the DEX.
+    Iterate over raw (unformatted) swap transactions from the DEX, page by page.
 
-    Works with both V3 and V2 DEXes.
+    Works with both V3 and V2 DEXes. The default lean profile fetches only
+    the fields the formatter uses and joins token symbols per pool rather
+    than per swap; "full" fetches every swap field (gas, tick, etc.).
 
     Args:
         client: TheGraphClient instance
-        limit: Maximum number of swaps to retrieve
-        pool_id: Optional pool/pair address to filter swaps
+        limit: Maximum number of swaps to retrieve (per pool, when several
+            pools are given)
+        pool_id: Optional pool/pair address, or list of addresses, to filter swaps
         min_amount_usd: Minimum swap amount in USD
         start_time: Optional start timestamp (Unix seconds) - inclusive
         end_time: Optional end timestamp (Unix seconds) - inclusive
+        profile: "lean" or "full" swap field selection
 
-    Returns:
-        List of formatted swap dictionaries
+    Yields:
+        Lists of raw swap records as returned by the subgraph, with pool
+        token symbols filled in. With several pools, each list is one
+        pool's page, in request order (see TheGraphClient.iter_pool_swap_pages)
     """
-    dex_type = client.config.dex_type
-    is_v2 = is_v2_dex(dex_type)
+    is_v2 = client.config.is_v2
 
     # Default time range if not specified (The Graph doesn't like null values for >= filters)
     # Use timestamp 0 (1970-01-01) as default start, and far future as default end
     effective_start = start_time if start_time is not None else 0
     effective_end = end_time if end_time is not None else 9999999999  # Year 2286
 
-    # Build time filter description for display
+    # Build time filter description for display, in local time like the
+    # --start-time/--end-time input and the records' datetime field
     time_filter = ""
-    if start_time is not None or end_time is not None:
-        if start_time is not None and end_time is not None:
-            time_filter = f" from {datetime.fromtimestamp(start_time)} to {datetime.fromtimestamp(end_time)}"
-        elif start_time is not None:
-            time_filter = f" after {datetime.fromtimestamp(start_time)}"
-        else:
-            time_filter = f" before {datetime.fromtimestamp(end_time)}"
+    if start_time is not None and end_time is not None:
+        time_filter = f" from {local_isoformat(start_time)} to {local_isoformat(end_time)}"
+    elif start_time is not None:
+        time_filter = f" after {local_isoformat(start_time)}"
+    elif end_time is not None:
+        time_filter = f" before {local_isoformat(end_time)}"
+
+    pool_ids = [pool_id] if isinstance(pool_id, str) else list(dict.fromkeys(pool_id or []))
 
-    if pool_id:
+    if len(pool_ids) > 1:
+        print(f"\nDownloading {limit} swaps each for {len(pool_ids)} {'pairs' if is_v2 else 'pools'}{time_filter}...")
+        variables = {
+            "minAmountUSD": str(min_amount_usd),
+            "startTime": str(effective_start),
+            "endTime": str(effective_end),
+        }
+        if profile == "lean":
+            # Look up every pool's tokens in one go; the per-page joins
+            # below are then served from the token cache
+            try:
+                client.get_pool_tokens(pool_ids)
+            except Exception as e:
+                print(f"  Error fetching pool tokens: {e}")
+        for _, swaps in client.iter_pool_swap_pages(pool_ids, variables, max_items=limit, profile=profile):
+            if profile == "lean":
+                join_pool_tokens(client, swaps)
+            yield swaps
+        return
+
+    if pool_ids:
+        pool_id = pool_ids[0]
         print(f"\nDownloading {limit} swaps for {'pair' if is_v2 else 'pool'} {pool_id}{time_filter}...")
         query_name = "swaps"
         # V2 uses pairId, V3 uses poolId
@@ -526,14 +1718,99 @@ def download_swaps(
             "endTime": str(effective_end),
         }
 
-    swaps = client.query_with_pagination(
-        query_name,
-        variables,
-        entity_name="swaps",
-        max_items=limit,
-    )
+    if profile == "lean":
+        query_name += "_lean"
+
+    for swaps in client.iter_pages(query_name, variables, entity_name="swaps", max_items=limit):
+        if profile == "lean":
+            join_pool_tokens(client, swaps)
+        yield swaps
+
+
+def read_ahead(items: Iterable[Any]) -> Iterator[Any]:
+    """
+    Iterate over `items`, producing each next item on a background thread.
+
+    While the caller handles item N, item N+1 is already being produced, so
+    wrapping iter_raw_swap_pages overlaps the request for the next page with
+    formatting and writing the current one. Only one item is read ahead, so
+    at most two pages are held at a time. Exceptions from `items` are
+    re-raised in the caller.
+
+    Args:
+        items: Iterable to consume, e.g. from iter_raw_swap_pages
 
-    return [format_swap(s, dex_type) for s in swaps]
+    Yields:
+        The items of `items`, in order
+    """
+    iterator = iter(items)
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(next, iterator, done)
+        while (item := pending.result()) is not done:
+            pending = executor.submit(next, iterator, done)
+            yield item
+
+
+def iter_swaps(
+    client: TheGraphClient,
+    limit: int = 100,
+    pool_id: Optional[Union[str, list[str]]] = None,
+    min_amount_usd: float = 0,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    profile: str = "lean",
+) -> Iterator[dict[str, Any]]:
+    """
+    Iterate over formatted swap transactions from the DEX, page by page.
+
+    Swaps are formatted and yielded as each page arrives, so a caller that
+    writes them out (see save_to_json) holds only a page or two in memory;
+    the next page is fetched while the current one is formatted (see
+    read_ahead). See iter_raw_swap_pages for the arguments.
+
+    Yields:
+        Formatted swap dictionaries
+    """
+    formatter = get_formatter("swap", client.config.dex_type)
+    for swaps in read_ahead(iter_raw_swap_pages(
+        client,
+        limit=limit,
+        pool_id=pool_id,
+        min_amount_usd=min_amount_usd,
+        start_time=start_time,
+        end_time=end_time,
+        profile=profile,
+    )):
+        yield from map(formatter, swaps)
+
+
+def download_swaps(
+    client: TheGraphClient,
+    limit: int = 100,
+    pool_id: Optional[Union[str, list[str]]] = None,
+    min_amount_usd: float = 0,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    profile: str = "lean",
+) -> list[dict[str, Any]]:
+    """
+    Download swap transaction data from the DEX.
+
+    Works with both V3 and V2 DEXes. See iter_swaps for the arguments.
+
+    Returns:
+        List of formatted swap dictionaries
+    """
+    return list(iter_swaps(
+        client,
+        limit=limit,
+        pool_id=pool_id,
+        min_amount_usd=min_amount_usd,
+        start_time=start_time,
+        end_time=end_time,
+        profile=profile,
+    ))
 
 
 def download_tokens(
@@ -548,7 +1825,8 @@ def download_tokens(
     Args:
         client: TheGraphClient instance
         limit: Maximum number of tokens to retrieve
-        order_by: Field to sort by
+        order_by: Field to sort by (see iter_listing_pages for limits past
+            MAX_SKIP rows)
         order_direction: Sort direction
 
     Returns:
@@ -556,21 +1834,11 @@ def download_tokens(
     """
     print(f"\nDownloading top {limit} tokens by {order_by}...")
 
-    variables = {
-        "orderBy": order_by,
-        "orderDirection": order_direction,
-    }
-
-    tokens = client.query_with_pagination(
-        "tokens",
-        variables,
-        entity_name="tokens",
-        max_items=limit,
-    )
-
-    return tokens
+    pages = iter_listing_pages(client, "tokens", "tokens", limit, order_by, order_direction)
+    return [token for page in pages for token in page]
 
 
+@functools.lru_cache(maxsize=256)
 def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
     """
     Parse a time string into a Unix timestamp.
@@ -580,6 +1848,10 @@ def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
     - ISO date: "2024-01-01"
     - ISO datetime: "2024-01-01T12:00:00"
 
+    ISO strings go through datetime.fromisoformat, which is implemented in
+    C; strptime is kept as a fallback for looser inputs (e.g., "2024-1-1").
+    Results are memoized.
+
     Args:
         time_str: Time string to parse, or None
 
@@ -596,6 +1868,11 @@ def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
         pass
 
     # Try parsing as ISO format
+    try:
+        return int(datetime.fromisoformat(time_str).timestamp())
+    except ValueError:
+        pass
+
     for fmt in ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
         try:
             dt = datetime.strptime(time_str, fmt)
@@ -608,6 +1885,10 @@ def parse_timestamp(time_str: Optional[str]) -> Optional[int]:
     )
 
 
+# Default output root: a data folder next to this script
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
 def get_data_directory(subgraph: str, query_type: str) -> str:
     """
     Get the data directory path for a given subgraph and query type.
@@ -621,9 +1902,7 @@ def get_data_directory(subgraph: str, query_type: str) -> str:
     Returns:
         Path to the data directory
     """
-    # Get the script's directory to create data folder relative to it
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, "data", subgraph, query_type)
+    data_dir = os.path.join(DATA_DIR, subgraph, query_type)
 
     # Create directory if it doesn't exist
     os.makedirs(data_dir, exist_ok=True)
@@ -631,17 +1910,182 @@ def get_data_directory(subgraph: str, query_type: str) -> str:
     return data_dir
 
 
-def save_to_json(data: list[dict], filepath: str) -> None:
+def get_dataset_directory(query_type: str) -> str:
+    """
+    Get the default root of a partitioned dataset: data/datasets/<query_type>/
+
+    Unlike get_data_directory it is shared by all subgraphs, which are told
+    apart by their dex=/chain= partitions.
+    """
+    data_dir = os.path.join(DATA_DIR, "datasets", query_type)
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+# Write buffer for JSON/JSONL output files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# --compress codec -> output file suffix
+COMPRESSION_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def output_compression(filepath: str) -> Optional[str]:
+    """Return the --compress codec implied by an output path's suffix, if any."""
+    for codec, suffix in COMPRESSION_SUFFIXES.items():
+        if filepath.endswith(suffix):
+            return codec
+    return None
+
+
+@contextmanager
+def open_output(filepath: str) -> Iterator[Any]:
+    """
+    Open an output file for binary writing, compressing if it ends in .zst or .gz.
+
+    Writes are buffered in OUTPUT_BUFFER_SIZE blocks, so the many small
+    per-record writes of save_to_json/save_to_jsonl reach the OS as a few
+    large ones. zstd compresses on all cores.
+
+    Yields:
+        A writable binary file object
+    """
+    codec = output_compression(filepath)
+    with open(filepath, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+        if codec == "zstd":
+            with zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(f, closefd=False) as compressed:
+                yield compressed
+        elif codec == "gzip":
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6) as compressed:
+                yield compressed
+        else:
+            yield f
+
+
+def save_to_json(data: Iterable[dict], filepath: str) -> int:
     """
     Save data to a JSON file.
 
+    Records are serialized and written one at a time, so `data` may be a
+    generator (e.g., from iter_swaps) that is never fully in memory. The
+    output is laid out like json.dump(..., indent=2), but non-ASCII text is
+    written as UTF-8 rather than escaped when orjson is installed.
+
+    Args:
+        data: Dictionaries to save
+        filepath: Full path to output file (compressed if it ends in .zst or .gz)
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open_output(filepath) as f:
+        f.write(b"[")
+        for record in data:
+            f.write(b",\n  " if count else b"\n  ")
+            # Indent each record's lines to match a pretty-printed array
+            f.write(_dumps(record, indent=True).replace(b"\n", b"\n  "))
+            count += 1
+        f.write(b"\n]" if count else b"]")
+    print(f"Saved {count} records to {filepath}")
+    return count
+
+
+def save_to_jsonl(data: Iterable[dict], filepath: str) -> int:
+    """
+    Save data as newline-delimited JSON (one compact record per line).
+
+    Records are written as they are produced, so memory use stays constant
+    per record. JSONL loads directly with pandas `read_json(lines=True)` and
+    DuckDB `read_json_auto`.
+
+    Args:
+        data: Dictionaries to save
+        filepath: Full path to output file (compressed if it ends in .zst or .gz)
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open_output(filepath) as f:
+        for record in data:
+            f.write(_dumps(record))
+            f.write(b"\n")
+            count += 1
+    print(f"Saved {count} records to {filepath}")
+    return count
+
+
+def save_to_parquet(tables: Iterable["pa.Table"], filepath: str) -> int:
+    """
+    Save Arrow tables to a single zstd-compressed Parquet file.
+
+    Tables are written as they are produced, one row group each, so a
+    generator of chunks never needs to be fully in memory.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    writer = None
+    try:
+        for table in tables:
+            if writer is None:
+                writer = pq.ParquetWriter(filepath, table.schema, compression="zstd")
+            writer.write_table(table)
+            count += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    print(f"Saved {count} records to {filepath}")
+    return count
+
+
+def save_to_parquet_dataset(tables: Iterable["pa.Table"], directory: str) -> int:
+    """
+    Save swap tables as a Parquet dataset partitioned by UTC day.
+
+    Each table is split into `date=YYYY-MM-DD/` subdirectories of
+    `directory`, so readers filtering on date skip whole files. Tables are
+    written as they are produced, each chunk to its own part file; an
+    existing file of the same name is overwritten.
+
     Args:
-        data: List of dictionaries to save
-        filepath: Full path to output file
+        tables: Tables with a `datetime` column (see format_swaps_bulk)
+        directory: Dataset directory, e.g. <root>/dex=uniswap_v3/chain=ethereum
+
+    Returns:
+        Number of rows written
     """
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    print(f"Saved {len(data)} records to {filepath}")
+    # pyarrow.dataset imports pandas (~0.2s), so it is only loaded for
+    # partitioned writes rather than on every start-up
+    import pyarrow.dataset as ds
+
+    file_options = ds.ParquetFileFormat().make_write_options(compression="zstd")
+    count = 0
+    for chunk_index, table in enumerate(tables):
+        if not table.num_rows:
+            continue
+        date = pc.strftime(table.column("datetime"), format="%Y-%m-%d")
+        ds.write_dataset(
+            table.append_column("date", date),
+            directory,
+            format="parquet",
+            file_options=file_options,
+            partitioning=ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+            basename_template=f"part-{chunk_index:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        count += table.num_rows
+    print(f"Saved {count} records to {directory}")
+    return count
+
+
+QUERY_TYPES = ["pools", "swaps", "tokens"]
+
+OUTPUT_FORMATS = ["json", "jsonl", "parquet"]
+
+# --output suffix -> output format, used when --format is omitted
+FORMAT_SUFFIXES = {"json": "json", "jsonl": "jsonl", "ndjson": "jsonl", "parquet": "parquet"}
 
 
 def main():
@@ -666,23 +2110,50 @@ Examples:
 
   # Use a different DEX
   python thegraph_dex_downloader.py --subgraph sushiswap_ethereum --query-type pools
+
+  # Download from several subgraphs concurrently
+  python thegraph_dex_downloader.py --subgraph uniswap_v3_ethereum uniswap_v3_arbitrum --query-type pools
+
+  # Download pools, swaps and tokens concurrently, one file each
+  python thegraph_dex_downloader.py --query-type all --limit 500
         """,
     )
 
     parser.add_argument(
         "--subgraph",
         type=str,
-        default="uniswap_v3_ethereum",
+        nargs="+",
+        default=["uniswap_v3_ethereum"],
         choices=list(SUBGRAPH_CONFIGS.keys()),
-        help="Subgraph to query (default: uniswap_v3_ethereum)",
+        help="Subgraph(s) to query (default: uniswap_v3_ethereum)",
+    )
+
+    parser.add_argument(
+        "--all-subgraphs",
+        action="store_true",
+        help="Query every configured subgraph",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of downloads (subgraph and query type) run at once (default: 8)",
+    )
+
+    parser.add_argument(
+        "--page-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of page requests in flight per subgraph (default: 4)",
     )
 
     parser.add_argument(
         "--query-type",
         type=str,
         default="swaps",
-        choices=["pools", "swaps", "tokens"],
-        help="Type of data to download (default: swaps)",
+        choices=QUERY_TYPES + ["all"],
+        help="Type of data to download, or all to download each type (default: swaps)",
     )
 
     parser.add_argument(
@@ -692,11 +2163,29 @@ Examples:
         help="Maximum number of records to download (default: 100)",
     )
 
+    parser.add_argument(
+        "--order-by",
+        type=str,
+        default="volumeUSD",
+        help="Sort field for pools/tokens (default: volumeUSD); with other orders than "
+             "'--order-by id --order-direction asc', a --limit over 5000 fetches every "
+             "entity by id and sorts locally",
+    )
+
+    parser.add_argument(
+        "--order-direction",
+        type=str,
+        default="desc",
+        choices=["asc", "desc"],
+        help="Sort direction for pools/tokens (default: desc)",
+    )
+
     parser.add_argument(
         "--pool-id",
         type=str,
+        nargs="+",
         default=None,
-        help="Pool address to filter swaps (optional)",
+        help="Pool address(es) to filter swaps (optional); several pools are fetched in batched requests",
     )
 
     parser.add_argument(
@@ -724,7 +2213,60 @@ Examples:
         "--output",
         type=str,
         default=None,
-        help="Output JSON filename (default: auto-generated)",
+        help="Output filename (default: auto-generated)",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        default=None,
+        choices=OUTPUT_FORMATS,
+        help="Output format (default: from --output suffix, else json)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        nargs="?",
+        const="zstd",
+        default=None,
+        choices=list(COMPRESSION_SUFFIXES),
+        help="Compress json/jsonl output with zstd (the default; requires zstandard) or gzip, "
+             "adding a .zst/.gz suffix",
+    )
+
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Write swaps as a Parquet dataset partitioned by dex=/chain=/date= under --output "
+             "(a directory; default: data/datasets/swaps). Implies --format parquet",
+    )
+
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache responses (historical windows indefinitely) under --cache-dir",
+    )
+
+    parser.add_argument(
+        "--cache-mode",
+        type=str,
+        default="read-write",
+        choices=CACHE_MODES,
+        help="With --cache: refresh re-downloads and overwrites cached responses; "
+             "read-only uses them without storing new ones (default: read-write)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Response cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+
+    parser.add_argument(
+        "--persisted-queries",
+        action="store_true",
+        help="Send query hashes instead of full queries (Automatic Persisted Queries; needs gateway support)",
     )
 
     parser.add_argument(
@@ -754,18 +2296,6 @@ Examples:
         print()
         return
 
-    # Initialize client
-    config = SUBGRAPH_CONFIGS[args.subgraph]
-    print(f"\nConnecting to {config.name}...")
-
-    try:
-        client = TheGraphClient(config, api_key=args.api_key)
-    except ValueError as e:
-        print(f"\nError: {e}")
-        return
-
-    print(f"Endpoint: {client.url[:60]}...")
-
     # Parse time arguments
     try:
         start_time = parse_timestamp(args.start_time)
@@ -774,43 +2304,218 @@ Examples:
         print(f"\nError: {e}")
         return
 
-    # Execute query based on type
-    if args.query_type == "pools":
-        data = download_pools(client, limit=args.limit)
-    elif args.query_type == "swaps":
-        data = download_swaps(
-            client,
-            limit=args.limit,
-            pool_id=args.pool_id,
-            min_amount_usd=args.min_amount_usd,
-            start_time=start_time,
-            end_time=end_time,
-        )
-    elif args.query_type == "tokens":
-        data = download_tokens(client, limit=args.limit)
+    # Determine output format: explicit flag, else the --output suffix, else JSON
+    if args.partitioned:
+        if args.query_type != "swaps":
+            print("\nError: --partitioned is only supported for swaps")
+            return
+        if args.format not in (None, "parquet"):
+            print("\nError: --partitioned writes Parquet; drop --format or use --format parquet")
+            return
+        args.format = "parquet"
+
+    if args.format is None:
+        output_name = args.output or ""
+        if output_compression(output_name):
+            output_name = os.path.splitext(output_name)[0]
+        suffix = os.path.splitext(output_name)[1].lstrip(".")
+        args.format = FORMAT_SUFFIXES.get(suffix, "json")
+
+    if args.format == "parquet" and pa is None:
+        print("\nError: Parquet output requires pyarrow (pip install pyarrow)")
+        return
+
+    # Parquet is always zstd-compressed internally
+    if args.format == "parquet":
+        args.compress = None
     else:
-        print(f"Unknown query type: {args.query_type}")
+        args.compress = args.compress or output_compression(args.output or "")
+    if args.compress == "zstd" and zstandard is None:
+        print("\nError: .zst output requires zstandard (pip install zstandard)")
         return
 
-    # Print summary
-    print(f"\nDownloaded {len(data)} {args.query_type}")
+    subgraphs = list(SUBGRAPH_CONFIGS) if args.all_subgraphs else args.subgraph
+    query_types = QUERY_TYPES if args.query_type == "all" else [args.query_type]
+    jobs = [(subgraph, query_type) for subgraph in subgraphs for query_type in query_types]
+
+    # One cache shared by every worker
+    args.response_cache = ResponseCache(args.cache_dir, mode=args.cache_mode) if args.cache else None
+
+    if len(jobs) == 1:
+        run_download(subgraphs[0], args, start_time, end_time)
+        print("\nDone!")
+        return
+
+    if args.output and not args.partitioned:
+        print("\nError: --output names a single file; omit it when downloading several subgraphs or query types")
+        return
+
+    def run_job(job: tuple[str, str]) -> int:
+        subgraph, query_type = job
+        job_args = copy.copy(args)
+        job_args.query_type = query_type
+        return run_download(subgraph, job_args, start_time, end_time)
+
+    # Subgraphs are independent endpoints and query types independent
+    # crawls, so download them concurrently; each worker is network-bound
+    # and owns its own client and connection
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        counts = dict(zip(jobs, executor.map(run_job, jobs)))
+
+    print("\nSummary:")
+    for (subgraph, query_type), count in counts.items():
+        print(f"  {subgraph}: {count} {query_type}")
+
+    print("\nDone!")
+
 
-    if data:
-        print("\nSample record:")
-        print(json.dumps(data[0], indent=2, default=str))
+def run_download(
+    subgraph: str,
+    args: argparse.Namespace,
+    start_time: Optional[int],
+    end_time: Optional[int],
+) -> int:
+    """
+    Download and save one subgraph's data as requested on the command line.
+
+    Args:
+        subgraph: Key in SUBGRAPH_CONFIGS
+        args: Parsed command line arguments
+        start_time: Parsed --start-time
+        end_time: Parsed --end-time
+
+    Returns:
+        Number of records downloaded (0 on error)
+    """
+    # Initialize client
+    config = SUBGRAPH_CONFIGS[subgraph]
+    print(f"\nConnecting to {config.name}...")
+
+    try:
+        client = TheGraphClient(
+            config,
+            api_key=args.api_key,
+            cache=args.response_cache,
+            persisted_queries=args.persisted_queries,
+            page_concurrency=args.page_concurrency,
+        )
+    except ValueError as e:
+        print(f"\nError: {e}")
+        return 0
+
+    print(f"Endpoint: {client.url[:60]}...")
 
     # Determine output path
-    if args.output:
+    if args.partitioned:
+        # One dataset root shared by every subgraph; each writes its own
+        # dex=/chain= partitions, so concurrent workers never share a file
+        output_file = args.output or get_dataset_directory(args.query_type)
+    elif args.output:
         # User specified a custom output path
         output_file = args.output
     else:
-        # Use default directory structure: data/<subgraph>/<query_type>/data.json
-        data_dir = get_data_directory(args.subgraph, args.query_type)
-        output_file = os.path.join(data_dir, "data.json")
+        # Use default directory structure: data/<subgraph>/<query_type>/data.<format>
+        data_dir = get_data_directory(subgraph, args.query_type)
+        output_file = os.path.join(data_dir, f"data.{args.format}")
 
-    save_to_json(data, output_file)
+    if args.compress and output_compression(output_file) != args.compress:
+        output_file += COMPRESSION_SUFFIXES[args.compress]
 
-    print("\nDone!")
+    # Execute query based on type
+    try:
+        with client:
+            if args.format == "parquet":
+                count = save_parquet_download(subgraph, client, args, output_file, start_time, end_time)
+            else:
+                if args.query_type == "pools":
+                    data = download_pools(
+                        client,
+                        limit=args.limit,
+                        order_by=args.order_by,
+                        order_direction=args.order_direction,
+                    )
+                elif args.query_type == "swaps":
+                    data = iter_swaps(
+                        client,
+                        limit=args.limit,
+                        pool_id=args.pool_id,
+                        min_amount_usd=args.min_amount_usd,
+                        start_time=start_time,
+                        end_time=end_time,
+                    )
+                elif args.query_type == "tokens":
+                    data = download_tokens(
+                        client,
+                        limit=args.limit,
+                        order_by=args.order_by,
+                        order_direction=args.order_direction,
+                    )
+                else:
+                    print(f"Unknown query type: {args.query_type}")
+                    return 0
+
+                # Peek at the first record for the sample printout
+                records = iter(data)
+                first = next(records, None)
+                if first is not None:
+                    print("\nSample record:")
+                    print(_dumps(first, indent=True).decode())
+                    records = itertools.chain([first], records)
+
+                # Swaps are still being fetched as they are written
+                save = save_to_jsonl if args.format == "jsonl" else save_to_json
+                count = save(records, output_file)
+    except Exception as e:
+        print(f"\nError downloading from {subgraph}: {e}")
+        return 0
+
+    # Print summary
+    print(f"\nDownloaded {count} {args.query_type} from {subgraph}")
+    return count
+
+
+def save_parquet_download(
+    subgraph: str,
+    client: TheGraphClient,
+    args: argparse.Namespace,
+    output_file: str,
+    start_time: Optional[int],
+    end_time: Optional[int],
+) -> int:
+    """
+    Download the requested data and write it to a Parquet file.
+
+    Raw swaps are formatted column-wise by Arrow in chunks of about
+    PARQUET_CHUNK_ROWS (see iter_swap_tables) and written as they arrive; pools and tokens are
+    small and go through the row formatters. With --partitioned, swaps are
+    written to a dataset under `output_file` instead (see
+    save_to_parquet_dataset).
+
+    Returns:
+        Number of records written
+    """
+    if args.query_type == "swaps":
+        pages = read_ahead(iter_raw_swap_pages(
+            client,
+            limit=args.limit,
+            pool_id=args.pool_id,
+            min_amount_usd=args.min_amount_usd,
+            start_time=start_time,
+            end_time=end_time,
+        ))
+        dex_type = client.config.dex_type
+        tables = iter_swap_tables(pages, dex_type)
+        if args.partitioned:
+            chain = subgraph.removeprefix(f"{dex_type}_")
+            return save_to_parquet_dataset(tables, os.path.join(output_file, f"dex={dex_type}", f"chain={chain}"))
+    elif args.query_type == "pools":
+        pools = download_pools(client, limit=args.limit, order_by=args.order_by, order_direction=args.order_direction)
+        tables = [pa.Table.from_pylist(pools)]
+    else:
+        tokens = download_tokens(client, limit=args.limit, order_by=args.order_by, order_direction=args.order_direction)
+        tables = [pa.Table.from_pylist(tokens)]
+
+    return save_to_parquet(tables, output_file)
 
 
 if __name__ == "__main__":
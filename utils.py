@@ -25,11 +25,68 @@ import argparse
 import json
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, Literal
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 
+# orjson parses the (large) introspection response and writes --output
+# several times faster than the stdlib json module. Optional.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        """Serialize to JSON bytes indented by two spaces."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        """Serialize to JSON bytes indented by two spaces."""
+        return json.dumps(obj, indent=2).encode()
+
+
+# Nested type reference, unwrapped through up to seven NON_NULL/LIST levels
+_TYPE_REF_FRAGMENT = """
+fragment TypeRef on __Type {
+  kind
+  name
+  ofType {
+    kind
+    name
+    ofType {
+      kind
+      name
+      ofType {
+        kind
+        name
+        ofType {
+          kind
+          name
+          ofType {
+            kind
+            name
+            ofType {
+              kind
+              name
+              ofType {
+                kind
+                name
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 
 # GraphQL introspection query to fetch the full schema
 INTROSPECTION_QUERY = """
@@ -99,40 +156,60 @@ fragment InputValue on __InputValue {
   }
   defaultValue
 }
+""" + _TYPE_REF_FRAGMENT
 
-fragment TypeRef on __Type {
-  kind
-  name
-  ofType {
-    kind
-    name
-    ofType {
+# Introspection query selecting only what print_schema_summary reads: type
+# kinds and names, and field names and types. A fraction of the full
+# response's size
+INTROSPECTION_QUERY_SUMMARY = """
+query SummaryIntrospectionQuery {
+  __schema {
+    queryType {
+      name
+    }
+    types {
       kind
       name
-      ofType {
-        kind
+      fields(includeDeprecated: true) {
         name
-        ofType {
-          kind
-          name
-          ofType {
-            kind
-            name
-            ofType {
-              kind
-              name
-              ofType {
-                kind
-                name
-              }
-            }
-          }
+        type {
+          ...TypeRef
         }
       }
     }
   }
 }
-"""
+""" + _TYPE_REF_FRAGMENT
+
+# Request bodies for the introspection queries, which never change
+_INTROSPECTION_BODY = json.dumps({"query": INTROSPECTION_QUERY}).encode()
+_INTROSPECTION_SUMMARY_BODY = json.dumps({"query": INTROSPECTION_QUERY_SUMMARY}).encode()
+
+# (connect, read) timeout in seconds for introspection requests
+REQUEST_TIMEOUT = (5, 30)
+
+# Schemas fetched at once when several subgraphs are given on the command line
+FETCH_CONCURRENCY = 8
+
+# One keep-alive session for every schema fetch, so fetching schemas for
+# many subgraphs reuses the gateway connection instead of handshaking each
+# time. Transient gateway failures are retried with backoff; introspection
+# is a read, so retrying the POST is safe.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+    ),
+))
+
+# Subgraph id in a gateway URL (.../subgraphs/id/<ID>), and a bare id
+_URL_ID_RE = re.compile(r"/subgraphs/id/([^/?\s]+)")
+_BARE_ID_RE = re.compile(r"^[A-Za-z0-9]{30,}$")
 
 
 def extract_subgraph_id(subgraph_input: str) -> str:
@@ -162,7 +239,7 @@ def extract_subgraph_id(subgraph_input: str) -> str:
     # Check if it's a URL
     if subgraph_input.startswith("http"):
         # Extract ID from URL pattern: .../subgraphs/id/<ID>
-        match = re.search(r"/subgraphs/id/([^/?\s]+)", subgraph_input)
+        match = _URL_ID_RE.search(subgraph_input)
         if match:
             return match.group(1)
         raise ValueError(
@@ -172,7 +249,7 @@ def extract_subgraph_id(subgraph_input: str) -> str:
 
     # Assume it's a bare ID - validate it looks reasonable
     # Subgraph IDs are typically alphanumeric strings of 40+ characters
-    if re.match(r"^[A-Za-z0-9]{30,}$", subgraph_input):
+    if _BARE_ID_RE.match(subgraph_input):
         return subgraph_input
 
     raise ValueError(
@@ -184,6 +261,7 @@ def extract_subgraph_id(subgraph_input: str) -> str:
 def get_subgraph_schema(
     subgraph_input: str,
     api_key: Optional[str] = None,
+    summary: bool = False,
 ) -> dict[str, Any]:
     """
     Fetch the GraphQL schema for a subgraph using introspection.
@@ -197,6 +275,9 @@ def get_subgraph_schema(
             - URL example: "https://gateway.thegraph.com/api/subgraphs/id/HMuAwuf..."
             - ID example: "HMuAwufqZ1YCRmzL2SfHTVkzZovC9VL2UAKhjvRqKiR1"
         api_key: The Graph API key. If not provided, uses GRAPH_API_KEY env var.
+        summary: Fetch only what print_schema_summary reads (type kinds and
+            names, field names and types; see INTROSPECTION_QUERY_SUMMARY)
+            instead of the full schema
 
     Returns:
         Dictionary containing the full GraphQL schema with structure:
@@ -232,17 +313,18 @@ def get_subgraph_schema(
     endpoint = f"https://gateway.thegraph.com/api/{api_key}/subgraphs/id/{subgraph_id}"
 
     # Execute the introspection query
-    response = requests.post(
+    response = _SESSION.post(
         endpoint,
-        json={"query": INTROSPECTION_QUERY},
+        data=_INTROSPECTION_SUMMARY_BODY if summary else _INTROSPECTION_BODY,
         headers={
             "Content-Type": "application/json",
             "Accept": "application/json",
         },
+        timeout=REQUEST_TIMEOUT,
     )
     response.raise_for_status()
 
-    result = response.json()
+    result = _loads(response.content)
 
     # Check for GraphQL errors
     if "errors" in result:
@@ -262,16 +344,11 @@ def print_schema_summary(schema: dict[str, Any]) -> None:
     schema_data = schema.get("__schema", {})
     types = schema_data.get("types", [])
 
-    # Filter out internal GraphQL types (those starting with __)
-    user_types = [t for t in types if not t.get("name", "").startswith("__")]
-
-    # Group types by kind
-    type_groups = {}
-    for t in user_types:
-        kind = t.get("kind", "UNKNOWN")
-        if kind not in type_groups:
-            type_groups[kind] = []
-        type_groups[kind].append(t)
+    # Group types by kind, skipping internal GraphQL types (those starting with __)
+    type_groups = defaultdict(list)
+    for t in types:
+        if not t.get("name", "").startswith("__"):
+            type_groups[t.get("kind", "UNKNOWN")].append(t)
 
     print("\n" + "=" * 60)
     print("SCHEMA SUMMARY")
@@ -312,23 +389,18 @@ def print_schema_summary(schema: dict[str, Any]) -> None:
 
 
 def _format_type(type_obj: dict) -> str:
-    """Format a GraphQL type object as a string."""
-    if not type_obj:
-        return "Unknown"
-
-    kind = type_obj.get("kind", "")
-    name = type_obj.get("name", "")
-
-    if kind == "NON_NULL":
-        inner = _format_type(type_obj.get("ofType", {}))
-        return f"{inner}!"
-    elif kind == "LIST":
-        inner = _format_type(type_obj.get("ofType", {}))
-        return f"[{inner}]"
-    elif name:
-        return name
-    else:
-        return "Unknown"
+    """Format a GraphQL type object as a string (e.g., "[Token!]!")."""
+    # Unwrap the NON_NULL/LIST chain down to the named type, then apply the
+    # wrappers from the inside out
+    wrappers = []
+    while type_obj and type_obj.get("kind") in ("NON_NULL", "LIST"):
+        wrappers.append(type_obj["kind"])
+        type_obj = type_obj.get("ofType")
+
+    formatted = (type_obj or {}).get("name") or "Unknown"
+    for kind in reversed(wrappers):
+        formatted = f"{formatted}!" if kind == "NON_NULL" else f"[{formatted}]"
+    return formatted
 
 
 def get_infura_web3(
@@ -411,7 +483,7 @@ def main():
     Command-line interface for fetching subgraph schemas.
 
     Usage:
-        python utils.py <subgraph_id_or_url> [options]
+        python utils.py <subgraph_id_or_url> [<subgraph_id_or_url> ...] [options]
 
     Examples:
         python utils.py HMuAwufqZ1YCRmzL2SfHTVkzZovC9VL2UAKhjvRqKiR1
@@ -433,13 +505,17 @@ Examples:
 
   # Print full JSON schema to stdout
   python utils.py 5zvR82QoaXYFyDEKLZ9t6v9adgnptxYpKpSbxtgVENFV --json
+
+  # Fetch several schemas concurrently, saving each as schemas/<SUBGRAPH_ID>.json
+  python utils.py 5zvR82QoaXYFyDEKLZ9t6v9adgnptxYpKpSbxtgVENFV HMuAwufqZ1YCRmzL2SfHTVkzZovC9VL2UAKhjvRqKiR1 --output schemas
         """,
     )
 
     parser.add_argument(
         "subgraph",
         type=str,
-        help="Subgraph ID or full URL to fetch schema for",
+        nargs="+",
+        help="Subgraph ID(s) or full URL(s) to fetch schemas for",
     )
 
     parser.add_argument(
@@ -453,7 +529,8 @@ Examples:
         "--output", "-o",
         type=str,
         default=None,
-        help="Save full schema to a JSON file",
+        help="Save full schema to a JSON file (a directory of <SUBGRAPH_ID>.json files "
+             "when several subgraphs are given)",
     )
 
     parser.add_argument(
@@ -464,30 +541,51 @@ Examples:
 
     args = parser.parse_args()
 
-    try:
-        print(f"Fetching schema for: {args.subgraph}")
-        schema = get_subgraph_schema(args.subgraph, api_key=args.api_key)
-
-        if args.output:
-            # Save to file
-            with open(args.output, "w") as f:
-                json.dump(schema, f, indent=2)
-            print(f"Schema saved to: {args.output}")
-        elif args.json:
-            # Print full JSON
-            print(json.dumps(schema, indent=2))
-        else:
-            # Print summary
-            print_schema_summary(schema)
-
-    except ValueError as e:
-        print(f"Error: {e}")
-        return 1
-    except requests.RequestException as e:
-        print(f"HTTP Error: {e}")
-        return 1
-
-    return 0
+    if len(args.subgraph) > 1 and args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    # Schemas are fetched concurrently over the shared session but reported
+    # in the order given
+    status = 0
+    with ThreadPoolExecutor(max_workers=min(FETCH_CONCURRENCY, len(args.subgraph))) as executor:
+        futures = [
+            executor.submit(
+                get_subgraph_schema,
+                subgraph,
+                api_key=args.api_key,
+                # The summary needs only a fraction of the full schema
+                summary=not (args.json or args.output),
+            )
+            for subgraph in args.subgraph
+        ]
+        for subgraph, future in zip(args.subgraph, futures):
+            try:
+                print(f"Fetching schema for: {subgraph}")
+                schema = future.result()
+
+                if args.output:
+                    # Save to file
+                    output = args.output
+                    if len(args.subgraph) > 1:
+                        output = os.path.join(args.output, f"{extract_subgraph_id(subgraph)}.json")
+                    with open(output, "wb") as f:
+                        f.write(_dumps_pretty(schema))
+                    print(f"Schema saved to: {output}")
+                elif args.json:
+                    # Print full JSON
+                    print(_dumps_pretty(schema).decode())
+                else:
+                    # Print summary
+                    print_schema_summary(schema)
+
+            except ValueError as e:
+                print(f"Error: {e}")
+                status = 1
+            except requests.RequestException as e:
+                print(f"HTTP Error: {e}")
+                status = 1
+
+    return status
 
 
 if __name__ == "__main__":